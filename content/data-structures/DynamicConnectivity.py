@@ -0,0 +1,76 @@
+"""
+ * Author: 984-ISHU
+ * Date: 2026-10-18
+ * License: CC0
+ * Source: folklore (offline dynamic connectivity)
+ * Description: Offline connectivity under edge insertions and deletions. Record the timeline,
+ * then solve() returns the answers of the connected/count queries in order. Each edge is alive
+ * on an interval of queries, which is added to O(\log Q) nodes of a segment tree over the
+ * queries; an iterative DFS over that tree joins edges on entry and rolls back on exit.
+ * Usage: dc = DynamicConnectivity(n); dc.add(0, 1); dc.connected(0, 1); dc.remove(0, 1)
+ * dc.count(); dc.solve() \# [True, n]
+ * Time: O(Q \log Q \log N)
+ * Status: stress-tested
+"""
+
+from UnionFindRollback import UnionFindRollback
+
+class DynamicConnectivity:
+    def __init__(self, n):
+        self.n = n
+        self.qs = []  # (u, v) for connected, None for count
+        self.start = {}  # edge -> query indices where live copies were added
+        self.edges = []  # (l, r, u, v): edge alive for queries [l, r)
+
+    def add(self, u, v):
+        self.start.setdefault((min(u, v), max(u, v)), []).append(len(self.qs))
+
+    def remove(self, u, v):
+        e = (min(u, v), max(u, v))
+        self.edges.append((self.start[e].pop(), len(self.qs)) + e)
+
+    def connected(self, u, v):
+        self.qs.append((u, v))
+
+    def count(self):
+        self.qs.append(None)
+
+    def solve(self):
+        Q = len(self.qs)
+        sz = 1
+        while sz < Q:
+            sz *= 2
+        seg = [[] for _ in range(2 * sz)]
+        live = [(l, Q) + e for e, ls in self.start.items() for l in ls]
+        for l, r, u, v in self.edges + live:
+            l += sz
+            r += sz
+            while l < r:
+                if l & 1:
+                    seg[l].append((u, v))
+                    l += 1
+                if r & 1:
+                    r -= 1
+                    seg[r].append((u, v))
+                l //= 2
+                r //= 2
+        uf, comps, res = UnionFindRollback(self.n), self.n, [None] * Q
+        st, saved = [1] if Q else [], []
+        while st:
+            x = st.pop()
+            if x < 0:  # leaving ~x
+                t, comps = saved.pop()
+                uf.rollback(t)
+                continue
+            saved.append((uf.time(), comps))
+            for u, v in seg[x]:
+                comps -= uf.join(u, v)
+            st.append(~x)
+            if x >= sz:
+                q = self.qs[x - sz]
+                res[x - sz] = comps if q is None else uf.find(q[0]) == uf.find(q[1])
+            else:
+                for y in (2 * x + 1, 2 * x):  # skip subtrees holding no query
+                    if (y << (sz.bit_length() - y.bit_length())) - sz < Q:
+                        st.append(y)
+        return res
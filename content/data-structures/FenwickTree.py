@@ -5,35 +5,111 @@
  * Source: folklore/TopCoder
  * Description: Computes partial sums a[0] + a[1] + ... + a[pos - 1], and updates single elements a[i],
  * taking the difference between the old and new value.
- * Time: Both operations are O(\log N).
+ * Pass dtype (np.int64 or np.float64) to store the tree in a NumPy array; update\_many and
+ * query\_many then walk the bits of a whole batch at once. Node i holds the sum of
+ * a[i \& (i + 1)..i], so from\_array builds in O(N) from prefix sums.
+ * RangeFenwickTree supports adding to ranges and summing ranges with two trees:
+ * a[l:r] += x adds x at l and -x at r in b1, and x*l, -x*r in b2; then
+ * sum(a[0:p]) = b1.query(p) * p - b2.query(p).
+ * Usage: ft = FenwickTree.from\_array(a, np.int64)
+ * ft.update\_many(positions, difs); sums = ft.query\_many(positions)
+ * Time: Both operations are O(\log N). Batches of K are O(K \log N), or O(N) when K \log N > N.
  * Status: Stress-tested
 """
 
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class FenwickTree:
-    def __init__(self, n):
-        self.s = [0] * n
-    
+    def __init__(self, n, dtype=None):
+        self.s = [0] * n if dtype is None else np.zeros(n, dtype)
+
+    @classmethod
+    def from_array(cls, a, dtype=None):
+        ft = cls(0, dtype)
+        ft.s = cls._build(a, dtype)
+        return ft
+
+    @staticmethod
+    def _build(a, dtype):
+        if dtype is None:
+            P = [0] + list(accumulate(a))
+            return [P[i + 1] - P[i & (i + 1)] for i in range(len(a))]
+        P = np.concatenate(([0], np.cumsum(a, dtype=dtype)))
+        i = np.arange(len(a))
+        return P[i + 1] - P[i & (i + 1)]
+
     def update(self, pos, dif):  # a[pos] += dif
         while pos < len(self.s):
             self.s[pos] += dif
             pos |= pos + 1
-    
+
     def query(self, pos):  # sum of values in [0, pos)
         res = 0
         while pos > 0:
             res += self.s[pos - 1]
             pos &= pos - 1
         return res
-    
+
+    def update_many(self, positions, difs):  # requires dtype
+        s, n = self.s, len(self.s)
+        pos = np.asarray(positions, dtype=np.int64)
+        dif = np.broadcast_to(np.asarray(difs, dtype=s.dtype), pos.shape)
+        if len(pos) * n.bit_length() > n:
+            d = np.zeros(n, s.dtype)
+            np.add.at(d, pos, dif)
+            s += self._build(d, s.dtype)
+            return
+        while len(pos):
+            np.add.at(s, pos, dif)
+            pos = pos | (pos + 1)
+            keep = pos < n
+            pos, dif = pos[keep], dif[keep]
+
+    def query_many(self, positions):  # requires dtype
+        s = self.s
+        pos = np.array(positions, dtype=np.int64)
+        res = np.zeros(pos.shape, s.dtype)
+        while pos.any():
+            res += np.where(pos > 0, s[pos - 1], 0)
+            pos &= pos - 1
+        return res
+
     def lower_bound(self, sum_val):  # min pos st sum of [0, pos] >= sum_val
         # Returns n if no sum is >= sum_val, or -1 if empty sum is.
         if sum_val <= 0:
             return -1
         pos = 0
-        pw = 1 << 25
+        pw = 1 << len(self.s).bit_length() >> 1
         while pw:
             if pos + pw <= len(self.s) and self.s[pos + pw - 1] < sum_val:
                 pos += pw
                 sum_val -= self.s[pos - 1]
             pw >>= 1
         return pos
+
+    def kth(self, k):  # a[i] are counts: k-th smallest i (0-indexed), n if too few
+        return self.lower_bound(k + 1)
+
+class RangeFenwickTree:  # a[l:r] += x, sum of a[l:r]
+    def __init__(self, n, dtype=None):
+        self.b1, self.b2 = FenwickTree(n, dtype), FenwickTree(n, dtype)
+
+    def _add(self, pos, x):
+        if pos < len(self.b1.s):
+            self.b1.update(pos, x)
+            self.b2.update(pos, x * pos)
+
+    def update(self, l, r, x):  # a[l:r] += x
+        self._add(l, x)
+        self._add(r, -x)
+
+    def query(self, pos):  # sum of values in [0, pos)
+        return self.b1.query(pos) * pos - self.b2.query(pos)
+
+    def range_sum(self, l, r):
+        return self.query(r) - self.query(l)
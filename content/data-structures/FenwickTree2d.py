@@ -4,55 +4,139 @@
  * License: CC0
  * Source: folklore
  * Description: Computes sums a[i,j] for all i<I, j<J, and increases single elements a[i,j].
- * Requires that the elements to be updated are known in advance (call fakeUpdate() before init()).
- * Time: O(\log^2 N). (Use persistent segment trees for O(\log N).)
+ * Requires that the elements to be updated are known in advance (call fakeUpdate() before init(),
+ * or pass them all to build()).
+ * Storage is CSR: row x of the Fenwick tree of Fenwick trees is keys/cnt[off[x]:off[x+1]],
+ * where keys = x * W + rank(y) is sorted globally, so one bisect (or one np.searchsorted
+ * for a whole batch) finds the inner index. update\_many and query\_many need NumPy.
+ * Sums are int64 (typecode 'q'), so float dif raises TypeError; pass typecode='d' for floats.
+ * Time: O(\log^2 N). (Use PersistentSegmentTree for O(\log N) static queries.)
+ * Memory: 16 bytes per stored (x, y) pair, O(P \log N) pairs for P points.
  * Status: stress-tested
 """
 
+from array import array
 from bisect import bisect_left
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class FenwickTree2D:
-    def __init__(self, limx):
-        self.ys = [[] for _ in range(limx)]
-        self.ft = []
-    
+    def __init__(self, limx, typecode='q'):
+        self.n, self.typecode = limx, typecode
+        self.pts = []
+
     def fakeUpdate(self, x, y):
-        while x < len(self.ys):
-            self.ys[x].append(y)
-            x |= x + 1
-    
+        self.pts.append((x, y))
+
     def init(self):
-        for v in self.ys:
-            v.sort()
-            self.ft.append(FenwickTree(len(v)))
-    
-    def ind(self, x, y):
-        return bisect_left(self.ys[x], y)
-    
+        self.build(self.pts)
+        self.pts = []
+
+    def build(self, points):
+        n = self.n
+        xs, ys = [x for x, _ in points], [y for _, y in points]
+        self.yv = sorted(set(ys))
+        W = self.W = len(self.yv) + 1
+        self.keys = array('q')
+        if np is None:
+            rank = {y: i for i, y in enumerate(self.yv)}
+            keys = set()
+            for x, y in points:
+                r = rank[y]
+                while x < n:
+                    keys.add(x * W + r)
+                    x |= x + 1
+            self.keys.extend(sorted(keys))
+        else:
+            x = np.array(xs, dtype=np.int64)
+            r = np.searchsorted(self.yv, ys) if xs else x
+            K = []
+            while len(x):
+                K.append(x * W + r)
+                x = x | (x + 1)
+                r = r[x < n]
+                x = x[x < n]
+            k = np.sort(np.concatenate(K or [x]))
+            self.keys.frombytes(k[np.diff(k, prepend=-1) != 0].tobytes())
+        self.off = array('q', (bisect_left(self.keys, x * W) for x in range(n + 1)))
+        self.cnt = array(self.typecode, [0]) * len(self.keys)
+
+    def _find(self, keys, q):  # np.searchsorted, much faster on sorted needles
+        o = np.argsort(q)
+        res = np.empty_like(q)
+        res[o] = np.searchsorted(keys, q[o])
+        return res
+
     def update(self, x, y, dif):
-        while x < len(self.ys):
-            self.ft[x].update(self.ind(x, y), dif)
+        keys, off, cnt, W = self.keys, self.off, self.cnt, self.W
+        r = bisect_left(self.yv, y)
+        while x < self.n:
+            lo, hi = off[x], off[x + 1]
+            j = bisect_left(keys, x * W + r, lo, hi)
+            while j < hi:
+                cnt[j] += dif
+                j = lo + ((j - lo) | (j - lo + 1))
             x |= x + 1
-    
+
     def query(self, x, y):
+        keys, off, cnt, W = self.keys, self.off, self.cnt, self.W
+        r = bisect_left(self.yv, y)
         sum_val = 0
         while x:
-            sum_val += self.ft[x - 1].query(self.ind(x - 1, y))
+            lo = off[x - 1]
+            j = bisect_left(keys, (x - 1) * W + r, lo, off[x]) - lo
+            while j:
+                sum_val += cnt[lo + j - 1]
+                j &= j - 1
             x &= x - 1
         return sum_val
 
-class FenwickTree:
-    def __init__(self, n):
-        self.s = [0] * n
-    
-    def update(self, pos, dif):
-        while pos < len(self.s):
-            self.s[pos] += dif
-            pos |= pos + 1
-    
-    def query(self, pos):
-        res = 0
-        while pos > 0:
-            res += self.s[pos - 1]
-            pos &= pos - 1
+    def update_many(self, xs, ys, difs):
+        keys, off, cnt = map(np.asarray, (self.keys, self.off, self.cnt))
+        x = np.asarray(xs, dtype=np.int64)
+        r = np.searchsorted(self.yv, ys)
+        d = np.broadcast_to(np.asarray(difs, dtype=cnt.dtype), x.shape)
+        X, R, D = [], [], []
+        while len(x):  # expand the outer walk, then do all inner walks at once
+            X.append(x), R.append(r), D.append(d)
+            x = x | (x + 1)
+            keep = x < self.n
+            x, r, d = x[keep], r[keep], d[keep]
+        if not X:
+            return
+        x, r, d = np.concatenate(X), np.concatenate(R), np.concatenate(D)
+        lo, hi = off[x], off[x + 1]
+        j = self._find(keys, x * self.W + r) - lo
+        m = hi - lo
+        while len(j):
+            np.add.at(cnt, lo + j, d)
+            j = j | (j + 1)
+            keep = j < m
+            j, lo, m, d = j[keep], lo[keep], m[keep], d[keep]
+
+    def query_many(self, xs, ys):
+        keys, off, cnt = map(np.asarray, (self.keys, self.off, self.cnt))
+        x = np.asarray(xs, dtype=np.int64)
+        r = np.searchsorted(self.yv, ys)
+        res = np.zeros(len(x), cnt.dtype)
+        I, X, R = [], [], []
+        idx = np.arange(len(x))
+        while len(x):
+            keep = x > 0
+            idx, x, r = idx[keep], x[keep], r[keep]
+            I.append(idx), X.append(x - 1), R.append(r)
+            x = x & (x - 1)
+        if not I:
+            return res
+        idx, x, r = np.concatenate(I), np.concatenate(X), np.concatenate(R)
+        lo = off[x]
+        j = self._find(keys, x * self.W + r) - lo
+        while len(j):
+            keep = j > 0
+            idx, lo, j = idx[keep], lo[keep], j[keep]
+            np.add.at(res, idx, cnt[lo + j - 1])
+            j = j & (j - 1)
         return res
@@ -4,10 +4,25 @@
  * License: CC0
  * Source: http://codeforces.com/blog/entry/60737
  * Description: Hash map with good performance. In Python, the built-in dict is already
- * highly optimized with similar performance characteristics. This is included for reference.
- * For competitive programming, simply use Python's dict.
+ * highly optimized with similar performance characteristics; use it unless memory matters.
+ * IntHashMap maps int64 keys to int64 values with open addressing (linear probing, load 1/2 to
+ * 3/4) over two typed arrays: 21-32 bytes per entry instead of ~100 for a dict, 21 if n is known
+ * up front. The hash is splitmix64 of the key plus a random seed, so it is safe against anti-hash
+ * tests. With NumPy, get\_many/add\_many probe a whole batch at once, and a rehash places all keys
+ * with one sort by home slot. The key -2^63 is reserved (ValueError).
+ * Usage: h = IntHashMap(); h.add(42, 1); h.get(42) \# 1
+ * h.add\_many(keys); counts = h.get\_many(keys)
+ * Time: O(1) expected per key
 """
 
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # Python's built-in dict is already highly optimized
 # and uses a similar hashing strategy.
 # Simply use: h = {}
@@ -20,3 +35,158 @@ def example():
     h[100] = 2
     print(h.get(42, 0))  # 1
     print(h.get(50, 0))  # 0 (default)
+
+EMPTY = -1 << 63
+M64 = (1 << 64) - 1
+
+class IntHashMap:
+    def __init__(self, n=0, seed=None):  # room for n keys before the first rehash
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.n = 0
+        self._alloc(max(16, -(-4 * n // 3)))
+
+    def _alloc(self, cap):
+        self.cap = cap
+        self.keys = array('q', [EMPTY]) * cap
+        self.vals = array('q', [0]) * cap
+
+    def _hash(self, x):
+        x = (x + self.seed) & M64
+        x = (x ^ x >> 30) * 0xbf58476d1ce4e5b9 & M64
+        x = (x ^ x >> 27) * 0x94d049bb133111eb & M64
+        return ((x ^ x >> 31) >> 32) * self.cap >> 32  # top 32 bits scaled to [0, cap)
+
+    def _slot(self, x):  # slot holding x, or the empty slot where it goes
+        keys, cap = self.keys, self.cap
+        i = self._hash(x)
+        while keys[i] != x and keys[i] != EMPTY:
+            i = i + 1 if i + 1 < cap else 0
+        return i
+
+    def _claim(self, x):  # slot of x, inserting it if missing
+        if x == EMPTY:
+            raise ValueError("IntHashMap: the key -2^63 is reserved")
+        i = self._slot(x)
+        if self.keys[i] == EMPTY:
+            if 4 * (self.n + 1) > 3 * self.cap:
+                self._rehash(3 * self.cap // 2)
+                i = self._slot(x)
+            self.keys[i] = x
+            self.n += 1
+        return i
+
+    def _rehash(self, cap):
+        keys, vals = self.keys, self.vals
+        self.n = 0
+        self._alloc(cap)
+        if np is None:
+            for x, v in zip(keys, vals):
+                if x != EMPTY:
+                    i = self._claim(x)
+                    self.vals[i] = v
+            return
+        K, V = np.frombuffer(keys, np.int64), np.frombuffer(vals, np.int64)
+        occ = K != EMPTY
+        x, v = K[occ], V[occ]
+        h = self._hash_many(x)
+        o = np.argsort(h)
+        x, v, h = x[o], v[o], h[o]
+        i = np.arange(len(x))
+        pos = i + np.maximum.accumulate(h - i)  # linear probing in slot order, ignoring wrap-around
+        w = pos >= self.cap
+        NK, NV = np.frombuffer(self.keys, np.int64), np.frombuffer(self.vals, np.int64)
+        NK[pos[~w]], NV[pos[~w]] = x[~w], v[~w]
+        self.n = len(x) - int(np.count_nonzero(w))
+        NV[self._place(x[w], np.zeros(np.count_nonzero(w), np.int64))] = v[w]  # wrapped around
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, x):
+        return x != EMPTY and self.keys[self._slot(x)] == x
+
+    def get(self, x, default=0):
+        i = self._slot(x)
+        return self.vals[i] if self.keys[i] == x != EMPTY else default
+
+    def set(self, x, v):
+        i = self._claim(x)  # may rehash, so look up self.vals afterwards
+        self.vals[i] = v
+
+    def add(self, x, v=1):
+        i = self._claim(x)
+        self.vals[i] += v
+
+    def _hash_many(self, x):
+        x = x.astype(np.uint64) + np.uint64(self.seed)
+        x = (x ^ x >> np.uint64(30)) * np.uint64(0xbf58476d1ce4e5b9)
+        x = (x ^ x >> np.uint64(27)) * np.uint64(0x94d049bb133111eb)
+        x = (x ^ x >> np.uint64(31)) >> np.uint64(32)
+        return (x * np.uint64(self.cap) >> np.uint64(32)).astype(np.int64)
+
+    def _find_many(self, x):  # slots of keys x, or ~(empty slot ending the probe) if missing
+        K, cap = np.frombuffer(self.keys, np.int64), self.cap
+        h, idx = self._hash_many(x), np.arange(len(x))
+        res = np.empty(len(x), np.int64)
+        while len(idx):
+            at = K[h]
+            hit, emp = at == x, at == EMPTY
+            res[idx[hit]] = h[hit]
+            res[idx[emp]] = ~h[emp]
+            keep = ~hit & ~emp
+            idx, h, x = idx[keep], (h[keep] + 1) % cap, x[keep]
+        return res
+
+    def _place(self, x, h=None):  # insert distinct new keys x, probing from h; returns slots
+        K, cap = np.frombuffer(self.keys, np.int64), self.cap
+        h = self._hash_many(x) if h is None else h
+        idx = np.arange(len(x))
+        res = np.empty(len(x), np.int64)
+        self.n += len(x)
+        while len(idx):
+            e = np.flatnonzero(K[h] == EMPTY)
+            K[h[e]] = x[e]  # keys racing for one slot: the last write wins, others probe on
+            e = e[K[h[e]] == x[e]]
+            res[idx[e]] = h[e]
+            keep = np.ones(len(idx), bool)
+            keep[e] = False
+            idx, h, x = idx[keep], (h[keep] + 1) % cap, x[keep]
+        return res
+
+    def get_many(self, xs, default=0):
+        if np is None:
+            return [self.get(x, default) for x in xs]
+        xs = np.asarray(xs, dtype=np.int64)
+        s = self._find_many(xs)
+        return np.where((s >= 0) & (xs != EMPTY), np.frombuffer(self.vals, np.int64)[s], default)
+
+    def add_many(self, xs, vs=1):
+        if np is None:
+            if EMPTY in xs:  # before any key goes in
+                raise ValueError("IntHashMap: the key -2^63 is reserved")
+            vs = [vs] * len(xs) if isinstance(vs, int) else vs
+            for x, v in zip(xs, vs):
+                self.add(x, v)
+            return
+        xs = np.asarray(xs, dtype=np.int64).ravel()
+        if (xs == EMPTY).any():
+            raise ValueError("IntHashMap: the key -2^63 is reserved")
+        vs = np.broadcast_to(np.asarray(vs, dtype=np.int64), xs.shape)
+        s = self._find_many(xs)
+        new = np.flatnonzero(s < 0)
+        if len(new):
+            U, inv = np.unique(xs[new], return_inverse=True)
+            h = np.empty(len(U), np.int64)
+            h[inv.ravel()] = ~s[new]  # where the probes for each new key ended
+            if 3 * self.cap < 4 * (self.n + len(U)):
+                self._rehash(max(3 * self.cap // 2, -(-4 * (self.n + len(U)) // 3)))
+                s, h = self._find_many(xs), None
+            s[new] = self._place(U, h)[inv.ravel()]
+        np.add.at(np.frombuffer(self.vals, np.int64), s, vs)
+
+    def items(self):  # (keys, values) in slot order
+        if np is None:
+            return [(x, v) for x, v in zip(self.keys, self.vals) if x != EMPTY]
+        K, V = np.frombuffer(self.keys, np.int64), np.frombuffer(self.vals, np.int64)
+        occ = K != EMPTY
+        return K[occ], V[occ]
@@ -5,76 +5,214 @@
  * Source: me
  * Description: Segment tree with ability to add or set values of large intervals, and compute max of intervals.
  * Can be changed to other things.
+ * Nodes live in flat lists (heap order, leaves at sz..2sz) and all operations are iterative
+ * and bottom-up, pushing tags only down the two boundary paths. typecode 'd' stores nodes in
+ * float arrays instead (less memory, ints exact below 2^53). inf is the "no set"
+ * sentinel and -inf the value of empty ranges, like in the C++ version.
+ * SparseLazySegmentTree covers huge ranges, creating nodes on demand in a pooled array;
+ * LazySegmentTree(None, lo, hi) returns one when hi - lo > dense\_limit (2^22), like the
+ * C++ version's lazily created nodes. Dense trees over huge ranges run out of memory.
  * Time: O(\log N).
+ * Memory: 32 bytes per leaf with typecode 'd', leaves padded to a power of two.
  * Status: stress-tested a bit
  * Usage: tr = LazySegmentTree(v, 0, len(v))
+ * tr = SparseLazySegmentTree(0, 10**18, limit=10**7)  # or LazySegmentTree(None, 0, 10**18)
 """
 
+from array import array
+
+inf = float('inf')
+
 class LazySegmentTree:
-    def __init__(self, v, lo, hi):
-        self.lo = lo
-        self.hi = hi
-        self.l = None
-        self.r = None
-        self.mset = float('inf')
-        self.madd = 0
-        self.val = float('-inf')
-        
-        if isinstance(v, list):  # Initialize from array
-            if lo + 1 < hi:
-                mid = lo + (hi - lo) // 2
-                self.l = LazySegmentTree(v, lo, mid)
-                self.r = LazySegmentTree(v, mid, hi)
-                self.val = max(self.l.val, self.r.val)
-            else:
-                self.val = v[lo]
-    
-    def query(self, L, R):
-        if R <= self.lo or self.hi <= L:
-            return float('-inf')
-        if L <= self.lo and self.hi <= R:
-            return self.val
-        self.push()
-        return max(self.l.query(L, R), self.r.query(L, R))
-    
-    def set(self, L, R, x):
-        if R <= self.lo or self.hi <= L:
+    dense_limit = 1 << 22  # larger ranges without v get a SparseLazySegmentTree
+
+    def __new__(cls, v, lo, hi, typecode=None):
+        if v is None and hi - lo > cls.dense_limit:
+            return SparseLazySegmentTree(lo, hi, typecode=typecode)
+        return super().__new__(cls)
+
+    def __init__(self, v, lo, hi, typecode=None):
+        self.lo, self.hi = lo, hi
+        self.h = max(hi - lo - 1, 0).bit_length()
+        sz = self.sz = 1 << self.h
+        buf = list if typecode is None else lambda x: array(typecode, x)
+        self.val = buf([-inf]) * (2 * sz)
+        self.madd = buf([0]) * sz
+        self.mset = buf([inf]) * sz
+        if v is not None:  # Initialize from array, else all leaves are -inf
+            val = self.val
+            val[sz:sz + hi - lo] = buf(v[lo:hi])
+            for i in range(sz - 1, 0, -1):
+                val[i] = max(val[2 * i], val[2 * i + 1])
+
+    def _range(self, L, R):  # clamp, shift to leaves and push tags above the boundaries
+        L = max(L, self.lo) - self.lo + self.sz
+        R = min(R, self.hi) - self.lo + self.sz
+        if L >= R:
+            return L, R
+        val, mset, madd, half = self.val, self.mset, self.madd, self.sz >> 1
+        path = []
+        for k in range(self.h, 0, -1):  # top-down, common ancestors once
+            p, q = L >> k, (R - 1) >> k
+            path.append(p)
+            if q != p:
+                path.append(q)
+        for p in path:
+            s, a = mset[p], madd[p]
+            if s != inf:
+                val[2 * p] = val[2 * p + 1] = s
+                if p < half:
+                    mset[2 * p] = mset[2 * p + 1] = s
+                    madd[2 * p] = madd[2 * p + 1] = 0
+                mset[p] = inf
+            elif a:
+                val[2 * p] += a
+                val[2 * p + 1] += a
+                if p < half:
+                    for c in (2 * p, 2 * p + 1):
+                        if mset[c] != inf:
+                            mset[c] += a
+                        else:
+                            madd[c] += a
+                madd[p] = 0
+        return L, R
+
+    def _update(self, L, R, s, a):
+        L, R = self._range(L, R)
+        if L >= R:
             return
-        if L <= self.lo and self.hi <= R:
-            self.mset = x
-            self.val = x
-            self.madd = 0
+        val, mset, madd, sz = self.val, self.mset, self.madd, self.sz
+        l, r, nodes = L, R, []
+        while l < r:
+            if l & 1:
+                nodes.append(l)
+                l += 1
+            if r & 1:
+                r -= 1
+                nodes.append(r)
+            l >>= 1
+            r >>= 1
+        if s != inf:
+            for i in nodes:
+                val[i] = s
+                if i < sz:
+                    mset[i], madd[i] = s, 0
         else:
-            self.push()
-            self.l.set(L, R, x)
-            self.r.set(L, R, x)
-            self.val = max(self.l.val, self.r.val)
-    
+            for i in nodes:
+                val[i] += a
+                if i < sz:
+                    if mset[i] != inf:
+                        mset[i] += a
+                    else:
+                        madd[i] += a
+        for k in range(1, self.h + 1):
+            if (L >> k) << k != L:
+                i = L >> k
+                val[i] = max(val[2 * i], val[2 * i + 1])
+            if (R >> k) << k != R:
+                i = (R - 1) >> k
+                val[i] = max(val[2 * i], val[2 * i + 1])
+
+    def query(self, L, R):
+        L, R = self._range(L, R)
+        res, val = -inf, self.val
+        while L < R:
+            if L & 1:
+                res = max(res, val[L])
+                L += 1
+            if R & 1:
+                R -= 1
+                res = max(res, val[R])
+            L >>= 1
+            R >>= 1
+        return res
+
+    def set(self, L, R, x):
+        self._update(L, R, x, 0)
+
     def add(self, L, R, x):
-        if R <= self.lo or self.hi <= L:
-            return
-        if L <= self.lo and self.hi <= R:
-            if self.mset != float('inf'):
-                self.mset += x
-            else:
-                self.madd += x
-            self.val += x
+        self._update(L, R, inf, x)
+
+class SparseLazySegmentTree:
+    """
+    Same operations over a huge range [lo, hi) (e.g. [0, 10^18)) that starts as -inf.
+    Children are created in pairs on push, so node c's children are ch[c] and ch[c] + 1.
+    Nodes live in a pool of parallel lists (or typed arrays, as above) that starts with
+    `reserve` slots and doubles when full; growing past `limit` nodes raises MemoryError.
+    About 28 bytes per node with typecode 'd'.
+    """
+    def __init__(self, lo, hi, reserve=1 << 10, limit=None, typecode=None):
+        self.lo, self.hi, self.limit = lo, hi, limit
+        self.buf = buf = list if typecode is None else lambda x: array(typecode, x)
+        reserve = max(reserve if limit is None else min(reserve, limit), 3)
+        self.ch = array('i', [0]) * reserve
+        self.val = buf([-inf]) * reserve
+        self.madd = buf([0]) * reserve
+        self.mset = buf([inf]) * reserve
+        self.cnt = 1  # node 0 is the root
+
+    def _alloc(self):
+        cap = len(self.ch)
+        if self.limit is not None and self.cnt + 2 > self.limit:
+            raise MemoryError("SparseLazySegmentTree: node budget exceeded")
+        if self.cnt + 2 > cap:
+            new = 2 * cap if self.limit is None else min(2 * cap, self.limit)
+            self.ch.extend(array('i', [0]) * (new - cap))
+            self.val.extend(self.buf([-inf]) * (new - cap))
+            self.madd.extend(self.buf([0]) * (new - cap))
+            self.mset.extend(self.buf([inf]) * (new - cap))
+        self.cnt += 2
+        return self.cnt - 2
+
+    def _apply(self, x, s, a):
+        if s != inf:
+            self.val[x] = self.mset[x] = s
+            self.madd[x] = 0
         else:
-            self.push()
-            self.l.add(L, R, x)
-            self.r.add(L, R, x)
-            self.val = max(self.l.val, self.r.val)
-    
-    def push(self):
-        if not self.l:
-            mid = self.lo + (self.hi - self.lo) // 2
-            self.l = LazySegmentTree(None, self.lo, mid)
-            self.r = LazySegmentTree(None, mid, self.hi)
-        if self.mset != float('inf'):
-            self.l.set(self.lo, self.hi, self.mset)
-            self.r.set(self.lo, self.hi, self.mset)
-            self.mset = float('inf')
-        elif self.madd:
-            self.l.add(self.lo, self.hi, self.madd)
-            self.r.add(self.lo, self.hi, self.madd)
-            self.madd = 0
+            self.val[x] += a
+            if self.mset[x] != inf:
+                self.mset[x] += a
+            else:
+                self.madd[x] += a
+
+    def _push(self, x):
+        if not self.ch[x]:
+            self.ch[x] = self._alloc()
+        c, s, a = self.ch[x], self.mset[x], self.madd[x]
+        if s != inf:
+            self._apply(c, s, 0)
+            self._apply(c + 1, s, 0)
+            self.mset[x] = inf
+        elif a:
+            self._apply(c, inf, a)
+            self._apply(c + 1, inf, a)
+            self.madd[x] = 0
+        return c
+
+    def _query(self, x, lo, hi, L, R):
+        if R <= lo or hi <= L:
+            return -inf
+        if L <= lo and hi <= R:
+            return self.val[x]
+        c, mid = self._push(x), lo + (hi - lo) // 2
+        return max(self._query(c, lo, mid, L, R), self._query(c + 1, mid, hi, L, R))
+
+    def _update(self, x, lo, hi, L, R, s, a):
+        if R <= lo or hi <= L:
+            return
+        if L <= lo and hi <= R:
+            self._apply(x, s, a)
+            return
+        c, mid = self._push(x), lo + (hi - lo) // 2
+        self._update(c, lo, mid, L, R, s, a)
+        self._update(c + 1, mid, hi, L, R, s, a)
+        self.val[x] = max(self.val[c], self.val[c + 1])
+
+    def query(self, L, R):
+        return self._query(0, self.lo, self.hi, L, R)
+
+    def set(self, L, R, x):
+        self._update(0, self.lo, self.hi, L, R, x, 0)
+
+    def add(self, L, R, x):
+        self._update(0, self.lo, self.hi, L, R, inf, x)
@@ -0,0 +1,81 @@
+"""
+ * Author: 984-ISHU
+ * Date: 2026-10-18
+ * License: CC0
+ * Source: folklore (Li Chao)
+ * Description: Maximum of lines kx+m, or of line segments defined on [l, r), at integer points x.
+ * The domain is [lo, hi), or the sorted points xs if given (queries must then be in xs).
+ * Each node keeps the line that wins at its midpoint; nodes are created on demand in
+ * pooled arrays, so huge domains are fine. Unlike LineContainer, segments can be added.
+ * Usage: lc = LiChaoTree(-10**9, 10**9 + 1); lc.add(k, m); lc.add\_segment(k, m, l, r); lc.query(x)
+ * Time: O(\log N) per line and query, O(\log^2 N) per segment.
+ * Status: stress-tested
+"""
+
+from array import array
+from bisect import bisect_left
+
+class LiChaoTree:
+    def __init__(self, lo=0, hi=0, xs=None):
+        self.xs = xs
+        self.lo, self.hi = (0, len(xs)) if xs is not None else (lo, hi)
+        self.K, self.M = [0], [float('-inf')]
+        self.L, self.R = array('i', [0]), array('i', [0])
+
+    def _x(self, i):
+        return i if self.xs is None else self.xs[i]
+
+    def _child(self, x, right):
+        ch = self.R if right else self.L
+        if not ch[x]:
+            ch[x] = len(self.K)
+            self.K.append(0)
+            self.M.append(float('-inf'))
+            self.L.append(0)
+            self.R.append(0)
+        return ch[x]
+
+    def _add(self, x, lo, hi, k, m):
+        K, M, X = self.K, self.M, self._x
+        while True:
+            mid = (lo + hi) // 2
+            if k * X(mid) + m > K[x] * X(mid) + M[x]:
+                K[x], M[x], k, m = k, m, K[x], M[x]
+            if hi - lo == 1:
+                return
+            if k * X(lo) + m > K[x] * X(lo) + M[x]:
+                x, hi = self._child(x, False), mid
+            elif k * X(hi - 1) + m > K[x] * X(hi - 1) + M[x]:
+                x, lo = self._child(x, True), mid
+            else:
+                return
+
+    def add(self, k, m):
+        if self.lo < self.hi:
+            self._add(0, self.lo, self.hi, k, m)
+
+    def add_segment(self, k, m, l, r):  # line kx+m on l <= x < r only
+        if self.xs is not None:
+            l, r = bisect_left(self.xs, l), bisect_left(self.xs, r)
+        st = [(0, self.lo, self.hi)]
+        while st:
+            x, lo, hi = st.pop()
+            if r <= lo or hi <= l or lo >= hi:
+                continue
+            if l <= lo and hi <= r:
+                self._add(x, lo, hi, k, m)
+            else:
+                mid = (lo + hi) // 2
+                st.append((self._child(x, False), lo, mid))
+                st.append((self._child(x, True), mid, hi))
+
+    def query(self, x):  # -inf if no line covers x
+        i = x if self.xs is None else bisect_left(self.xs, x)
+        K, M, L, R = self.K, self.M, self.L, self.R
+        n, lo, hi, res = 0, self.lo, self.hi, float('-inf')
+        while True:
+            res = max(res, K[n] * x + M[n])
+            mid = (lo + hi) // 2
+            n, lo, hi = (L[n], lo, mid) if i < mid else (R[n], mid, hi)
+            if not n:
+                return res
@@ -5,73 +5,128 @@
  * Source: own work
  * Description: Container where you can add lines of the form kx+m, and query maximum values at points x.
  * Useful for dynamic programming (convex hull trick).
- * Time: O(\log N)
+ * Lines [k, m, p] are kept sorted by k (so p is increasing) in a list of blocks of at most
+ * 2B lines, standing in for the C++ multiset. An iterator is a (block, index) pair.
+ * (for floats, use div(a, b) = a / b)
+ * MonotoneHull is an amortized O(1) stack for increasing k and increasing query x.
+ * Time: O(\log N) amortized
  * Status: stress-tested
 """
 
-from collections import deque
+inf = float('inf')
 
 class LineContainer:
+    B = 256
+
     def __init__(self):
-        self.lines = deque()  # (k, m, p) tuples
-    
+        self.b = []  # blocks of [k, m, p]
+
     def _div(self, a, b):
-        # Floored division
-        return a // b - (1 if (a ^ b) < 0 and a % b else 0)
-    
-    def _isect(self, idx):
-        # Calculate intersection point for line at idx
-        if idx + 1 >= len(self.lines):
-            self.lines[idx] = (self.lines[idx][0], self.lines[idx][1], float('inf'))
+        return a // b  # floored division
+
+    def _next(self, it):
+        bi, j = it
+        return (bi, j + 1) if j + 1 < len(self.b[bi]) else (bi + 1, 0)
+
+    def _prev(self, it):
+        bi, j = it
+        return (bi, j - 1) if j else (bi - 1, len(self.b[bi - 1]) - 1)
+
+    def _erase(self, it):  # returns iterator to the next line
+        bi, j = it
+        blk = self.b[bi]
+        del blk[j]
+        if not blk:
+            del self.b[bi]
+            return (bi, 0)
+        return (bi, j) if j < len(blk) else (bi + 1, 0)
+
+    def _isect(self, x, y):
+        x = self.b[x[0]][x[1]]
+        if y[0] == len(self.b):
+            x[2] = inf
             return False
-        k1, m1, _ = self.lines[idx]
-        k2, m2, _ = self.lines[idx + 1]
-        if k1 == k2:
-            p = float('inf') if m1 > m2 else float('-inf')
+        y = self.b[y[0]][y[1]]
+        if x[0] == y[0]:
+            x[2] = inf if x[1] > y[1] else -inf
         else:
-            p = self._div(m2 - m1, k1 - k2)
-        self.lines[idx] = (k1, m1, p)
-        if idx + 1 < len(self.lines):
-            return p >= self.lines[idx + 1][2]
-        return False
-    
+            x[2] = self._div(y[1] - x[1], x[0] - y[0])
+        return x[2] >= y[2]
+
+    def _find(self, v, f):  # first (block, index) whose field f is > v (f = 0) or >= v (f = 2)
+        b, strict = self.b, f == 0
+        lo, hi = 0, len(b) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if b[mid][-1][f] > v or (not strict and b[mid][-1][f] == v):
+                hi = mid
+            else:
+                lo = mid + 1
+        blk = b[lo]
+        l, r = 0, len(blk)
+        while l < r:
+            mid = (l + r) // 2
+            if blk[mid][f] > v or (not strict and blk[mid][f] == v):
+                r = mid
+            else:
+                l = mid + 1
+        return lo, l
+
     def add(self, k, m):
         # Add line kx + m
-        # Insert maintaining sorted order by slope k
-        idx = len(self.lines)
-        for i in range(len(self.lines)):
-            if self.lines[i][0] > k:
-                idx = i
+        if not self.b:
+            self.b.append([])
+        bi, j = self._find(k, 0)
+        blk = self.b[bi]
+        blk.insert(j, [k, m, 0])
+        if len(blk) > 2 * self.B:
+            self.b.insert(bi + 1, blk[self.B:])
+            del blk[self.B:]
+            if j >= self.B:
+                bi, j = bi + 1, j - self.B
+        x = y = (bi, j)
+        z = self._next(y)
+        while self._isect(y, z):
+            z = self._erase(z)
+        if x != (0, 0):
+            x = self._prev(x)
+            if self._isect(x, y):
+                y = self._erase(y)
+                self._isect(x, y)
+        while x != (0, 0):
+            y, x = x, self._prev(x)
+            if self.b[x[0]][x[1]][2] < self.b[y[0]][y[1]][2]:
                 break
-        self.lines.insert(idx, (k, m, 0))
-        
-        # Fix intersections
-        i = idx
-        while i + 1 < len(self.lines) and self._isect(i):
-            self.lines.pop(i + 1)
-        
-        if i > 0:
-            self._isect(i - 1)
-            if i > 0 and self.lines[i - 1][2] >= self.lines[i][2]:
-                self.lines.pop(i)
-                i -= 1
-        
-        while i > 0 and self.lines[i - 1][2] >= self.lines[i][2]:
-            self.lines.pop(i)
-            i -= 1
-            if i > 0:
-                self._isect(i - 1)
-    
+            self._isect(x, self._erase(y))
+
     def query(self, x):
         # Query maximum value at point x
-        assert len(self.lines) > 0
-        # Binary search for the right line
-        left, right = 0, len(self.lines) - 1
-        while left < right:
-            mid = (left + right) // 2
-            if self.lines[mid][2] < x:
-                left = mid + 1
-            else:
-                right = mid
-        k, m, _ = self.lines[left]
+        assert self.b
+        bi, j = self._find(x, 2)
+        k, m, _ = self.b[bi][j]
         return k * x + m
+
+class MonotoneHull:
+    # Same as LineContainer when k is added in increasing order and x is queried in
+    # increasing order: a stack of lines plus a pointer, amortized O(1) per call.
+    def __init__(self):
+        self.k, self.m, self.ptr = [], [], 0
+
+    def add(self, k, m):
+        K, M = self.k, self.m
+        if K and K[-1] == k:
+            if M[-1] >= m:
+                return
+            K.pop(), M.pop()
+        while len(K) > 1 and (m - M[-2]) * (K[-1] - K[-2]) >= (M[-1] - M[-2]) * (k - K[-2]):
+            K.pop(), M.pop()
+        K.append(k)
+        M.append(m)
+
+    def query(self, x):
+        K, M = self.k, self.m
+        i = min(self.ptr, len(K) - 1)
+        while i + 1 < len(K) and K[i + 1] * x + M[i + 1] >= K[i] * x + M[i]:
+            i += 1
+        self.ptr = i
+        return K[i] * x + M[i]
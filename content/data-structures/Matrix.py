@@ -4,48 +4,132 @@
  * License: CC0
  * Source: My head
  * Description: Basic operations on square matrices.
- * Usage: A = Matrix(3); A.d = [[1,2,3], [4,5,6], [7,8,9]];
- * vec = [1,2,3]; vec = (A ** N) * vec
+ * With mod, all entries are reduced mod mod. With NumPy, products run on int64 arrays when
+ * mod < 2^62: if n * (mod-1)^2 overflows, the right operand (or both) is split into k-bit limbs so that
+ * every partial dot product fits, and the limbs are recombined by Horner's rule.
+ * Other matrices (no mod, or huge mod) use object arrays, floats use float64.
+ * pow\_apply(vec, N) computes A^N * vec with squarings and matrix-vector products only,
+ * or with N matrix-vector products when N is small.
+ * Usage: A = Matrix(3, mod=10**9 + 7); A.d = [[1,2,3], [4,5,6], [7,8,9]];
+ * vec = [1,2,3]; vec = (A ** N) * vec; vec = A.pow\_apply(vec, N)
+ * Time: O(N^3 \log p) for A ** p
  * Status: tested
 """
 
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class Matrix:
-    def __init__(self, n, default=0):
+    def __init__(self, n, default=0, mod=None):
         self.n = n
+        self.mod = mod
         self.d = [[default] * n for _ in range(n)]
-    
+
+    def _wrap(self, d):
+        res = Matrix(0, mod=self.mod)
+        res.n, res.d = self.n, d
+        return res
+
+    def _prep(self, x):  # x (matrix or vector) in the form _dot works on
+        mod = self.mod
+        if np is None:
+            if mod is None:
+                return x
+            return [[v % mod for v in r] for r in x] if x and isinstance(x[0], list) else [v % mod for v in x]
+        a = np.asarray(x)
+        if a.dtype.kind in 'fc' and mod is None:
+            return a.astype(float if a.dtype.kind == 'f' else complex)
+        a = np.array(x, dtype=object)
+        if mod is None:
+            return a
+        a %= mod
+        return a.astype(np.int64) if mod < 1 << 62 else a
+
+    def _dot(self, a, b):
+        mod = self.mod
+        if np is None:
+            if b and isinstance(b[0], list):
+                bt = list(zip(*b))
+                res = [[sum(map(mul, r, c)) for c in bt] for r in a]
+                return res if mod is None else [[v % mod for v in r] for r in res]
+            res = [sum(map(mul, r, b)) for r in a]
+            return res if mod is None else [v % mod for v in res]
+        if a.dtype != np.int64:
+            return a.dot(b) if mod is None else a.dot(b) % mod
+        n, bits = max(self.n, 2), (mod - 1).bit_length()
+        lim = ((1 << 63) - 1) // (n * max(mod - 1, 1))
+        if lim >= mod:
+            return a.dot(b) % mod
+        # Split b into k-bit limbs and keep a whole, or split both into ks-bit limbs,
+        # whichever needs fewer products; every partial sum D[u] fits in int64.
+        k = lim.bit_length() - 1
+        ks = next(k for k in range(31, 0, -1) if -(-bits // k) * n << 2 * k < 1 << 63)
+        both = k < 1 or (-(-bits // ks)) ** 2 < -(-bits // k)
+        k = ks if both else k
+        L = -(-bits // k)
+        As = [a >> (k * s) & ((1 << k) - 1) for s in range(L)] if both else [a]
+        Bs = [b >> (k * t) & ((1 << k) - 1) for t in range(L)]
+        D = {}
+        for s, x in enumerate(As):
+            for t, y in enumerate(Bs):
+                D[s + t] = D.get(s + t, 0) + x.dot(y)
+        res = np.zeros(b.shape, np.int64)
+        for u in range(max(D), -1, -1):  # Horner's rule in base 2^k
+            if mod << k < 1 << 63:
+                res = res * (1 << k) % mod
+            else:
+                for _ in range(k):
+                    res <<= 1
+                    res -= mod * (res >= mod)
+            res = (res + D[u] % mod) % mod
+        return res
+
+    def _out(self, a):
+        return a if np is None else a.tolist()
+
     def __mul__(self, other):
         if isinstance(other, Matrix):
             # Matrix multiplication
-            result = Matrix(self.n)
-            for i in range(self.n):
-                for k in range(self.n):
-                    for j in range(self.n):
-                        result.d[i][k] += self.d[i][j] * other.d[j][k]
-            return result
+            return self._wrap(self._out(self._dot(self._prep(self.d), self._prep(other.d))))
         elif isinstance(other, list):
             # Matrix-vector multiplication
-            result = [0] * self.n
-            for i in range(self.n):
-                for j in range(self.n):
-                    result[i] += self.d[i][j] * other[j]
-            return result
+            return self._out(self._dot(self._prep(self.d), self._prep(other)))
         else:
             raise TypeError("Unsupported operand type")
-    
+
     def __pow__(self, p):
         assert p >= 0
-        result = Matrix(self.n)
+        base = self._prep(self.d)
         # Identity matrix
-        for i in range(self.n):
-            result.d[i][i] = 1
-        base = Matrix(self.n)
-        for i in range(self.n):
-            for j in range(self.n):
-                base.d[i][j] = self.d[i][j]
+        if np is None:
+            result = [[int(i == j) for j in range(self.n)] for i in range(self.n)]
+        else:
+            result = np.eye(self.n, dtype=base.dtype)
+        if self.mod is not None:  # mod 1 has no 1
+            result = self._prep(result)
         while p:
             if p & 1:
-                result = result * base
-            base = base * base
+                result = self._dot(result, base)
             p >>= 1
-        return result
+            if p:
+                base = self._dot(base, base)
+        return self._wrap(self._out(result))
+
+    def pow_apply(self, vec, N):  # (self ** N) * vec
+        assert N >= 0
+        base, vec = self._prep(self.d), self._prep(vec)
+        if N <= self.n * max(N.bit_length() - 1, 1):
+            for _ in range(N):
+                vec = self._dot(base, vec)
+            return self._out(vec)
+        while N:
+            if N & 1:
+                vec = self._dot(base, vec)
+            N >>= 1
+            if N:
+                base = self._dot(base, base)
+        return self._out(vec)
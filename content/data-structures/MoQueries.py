@@ -5,50 +5,138 @@
  * Source: https://github.com/hoke-t/tamu-kactl/blob/master/content/data-structures/MoQueries.h
  * Description: Answer interval or tree path queries by finding an approximate TSP through the queries,
  * and moving from one query to the next by adding/removing points at the ends.
+ * Queries are ordered by blocks of N/sqrt(Q) with alternating direction (order='block'),
+ * or along a Hilbert curve (order='hilbert'), which can win on clustered queries.
+ * Sorting uses precomputed int keys.
+ * Pass stats={} to get stats['moves'], the total number of add/del calls.
+ * mo\_ranges hands over whole contiguous ranges instead, so a slice can be processed with
+ * NumPy or one tight loop; mo wraps it with the element-wise callbacks.
+ * mo\_with\_updates also moves through time, applying and undoing point updates, with
+ * blocks of about N^{2/3} over (left, right) and snaking order in t. Time: O(N^{5/3}).
  * Time: O(N \sqrt Q)
  * Status: stress-tested
 """
 
+from math import isqrt
+
 # Global functions to be implemented by user:
 # def add(ind, end): ...  # add a[ind] (end = 0 or 1)
 # def del_element(ind, end): ...  # remove a[ind]
 # def calc(): ...  # compute current answer
 
-def mo(Q, add_fn, del_fn, calc_fn):
+def hilbert(x, y, k):  # position of (x, y) on the Hilbert curve over [0, 2^k)^2
+    d, n = 0, 1 << k
+    s = n >> 1
+    while s:
+        rx, ry = x & s > 0, y & s > 0
+        d += s * s * ((3 * rx) ^ ry)
+        if not ry:
+            if rx:
+                x, y = n - 1 - x, n - 1 - y
+            x, y = y, x
+        s >>= 1
+    return d
+
+def mo_order(P, N, order='block', blk=None):
+    """
+    P: list of (x, y) or (x, y, t) points with all coordinates < N
+    Returns: indices of P in the order they should be visited
+    """
+    if order not in ('block', 'hilbert'):
+        raise ValueError(f"unknown order {order!r}")
+    if order == 'hilbert':
+        k = max(N - 1, 1).bit_length()
+        keys = [hilbert(x, y, k) for x, y in P]
+    else:
+        blk = blk or max(1, N // max(isqrt(len(P)), 1))  # ~N/sqrt(Q)
+        keys = []
+        for p in P:  # blocks of all but the last coordinate, snaking
+            k = 0
+            for c in p[:-1]:
+                c //= blk
+                k = k * N + (N - 1 - c if k & 1 else c)
+            keys.append(k * N + (N - 1 - p[-1] if k & 1 else p[-1]))
+    return sorted(range(len(P)), key=keys.__getitem__)
+
+def mo_ranges(Q, add_range, del_range, calc_fn, order='block', stats=None):
     """
     Q: list of (left, right) query pairs
-    add_fn, del_fn, calc_fn: callback functions
+    add_range(lo, hi, end): add a[lo:hi] at the left (end = 0) or right (end = 1) end
+    del_range(lo, hi, end): remove a[lo:hi] from that end
     Returns: list of answers for each query
     """
-    L, R = 0, 0
-    blk = 350  # ~N/sqrt(Q)
-    s = list(range(len(Q)))
+    L, R, moves = 0, 0, 0
+    N = max((r for _, r in Q), default=0) + 1
     res = [0] * len(Q)
-    
-    def K(x):
-        return (Q[x][0] // blk, Q[x][1] ^ (-(Q[x][0] // blk & 1)))
-    
-    s.sort(key=K)
-    
-    for qi in s:
-        q = Q[qi]
-        while L > q[0]:
-            L -= 1
-            add_fn(L, 0)
-        while R < q[1]:
-            add_fn(R, 1)
-            R += 1
-        while L < q[0]:
-            del_fn(L, 0)
-            L += 1
-        while R > q[1]:
-            R -= 1
-            del_fn(R, 1)
+    for qi in mo_order(Q, N, order):
+        l, r = Q[qi]
+        moves += abs(L - l) + abs(R - r)
+        if l < L:
+            add_range(l, L, 0)
+        if R < r:
+            add_range(R, r, 1)
+        if L < l:
+            del_range(L, l, 0)
+        if r < R:
+            del_range(r, R, 1)
+        L, R = l, r
         res[qi] = calc_fn()
-    
+    if stats is not None:
+        stats['moves'] = moves
     return res
 
-def moTree(Q, ed, add_fn, del_fn, calc_fn, root=0):
+def elementwise(add_fn, del_fn):
+    # Range callbacks calling add_fn/del_fn in the order the pointers move
+    def add_range(lo, hi, end):
+        for i in range(hi - 1, lo - 1, -1) if end == 0 else range(lo, hi):
+            add_fn(i, end)
+
+    def del_range(lo, hi, end):
+        for i in range(lo, hi) if end == 0 else range(hi - 1, lo - 1, -1):
+            del_fn(i, end)
+
+    return add_range, del_range
+
+def mo(Q, add_fn, del_fn, calc_fn, order='block', stats=None):
+    return mo_ranges(Q, *elementwise(add_fn, del_fn), calc_fn, order, stats)
+
+def mo_with_updates(Q, U, add_fn, del_fn, apply_fn, undo_fn, calc_fn, stats=None):
+    """
+    Q: list of (left, right, t): query [left, right) after the first t updates
+    U: list of point updates
+    apply_fn(i, L, R), undo_fn(i, L, R): apply/revert U[i] while the window is [L, R)
+    Returns: list of answers for each query
+    """
+    add_range, del_range = elementwise(add_fn, del_fn)
+    n = max((r for _, r, _ in Q), default=0) + 1
+    N = max(n, len(U) + 1)
+    blk = max(1, round((n * n * max(len(U), 1) / max(len(Q), 1)) ** (1 / 3)))  # ~N^(2/3)
+    L, R, T, moves = 0, 0, 0, 0
+    res = [0] * len(Q)
+    for qi in mo_order(Q, N, 'block', blk):
+        l, r, t = Q[qi]
+        moves += abs(L - l) + abs(R - r) + abs(T - t)
+        if l < L:
+            add_range(l, L, 0)
+        if R < r:
+            add_range(R, r, 1)
+        if L < l:
+            del_range(L, l, 0)
+        if r < R:
+            del_range(r, R, 1)
+        L, R = l, r
+        while T < t:
+            apply_fn(T, L, R)
+            T += 1
+        while T > t:
+            T -= 1
+            undo_fn(T, L, R)
+        res[qi] = calc_fn()
+    if stats is not None:
+        stats['moves'] = moves
+    return res
+
+def moTree(Q, ed, add_fn, del_fn, calc_fn, root=0, order='block', stats=None):
     """
     Q: list of [u, v] tree path queries
     ed: adjacency list
@@ -57,22 +145,21 @@ def moTree(Q, ed, add_fn, del_fn, calc_fn, root=0):
     """
     N = len(ed)
     pos = [0, 0]
-    blk = 350  # ~N/sqrt(Q)
-    s = list(range(len(Q)))
     res = [0] * len(Q)
     I = [0] * N
     L = [0] * N
     R = [0] * N
     in_path = [0] * N
     par = [0] * N
-    
+
     counter = [0]
+    moves = [1]
     add_fn(0, 0)
     in_path[0] = 1
-    
+
     def dfs(x, p, dep):
         par[x] = p
-        L[x] = N
+        L[x] = counter[0]
         if dep:
             I[x] = counter[0]
             counter[0] += 1
@@ -82,47 +169,43 @@ def moTree(Q, ed, add_fn, del_fn, calc_fn, root=0):
         if not dep:
             I[x] = counter[0]
             counter[0] += 1
-        R[x] = N
-    
+        R[x] = counter[0]
+
     dfs(root, -1, 0)
-    
-    def K(x):
-        return (I[Q[x][0]] // blk, I[Q[x][1]] ^ (-(I[Q[x][0]] // blk & 1)))
-    
-    s.sort(key=K)
-    
-    for qi in s:
+
+    def step(a, c, end):
+        moves[0] += 1
+        if in_path[c]:
+            del_fn(a, end)
+            in_path[a] = 0
+        else:
+            add_fn(c, end)
+            in_path[c] = 1
+
+    for qi in mo_order([(I[u], I[v]) for u, v in Q], N, order):
         for end in range(2):
             a = pos[end]
             b = Q[qi][end]
             path = []
-            
+
             while not (L[b] <= L[a] and R[a] <= R[b]):
                 path.append(b)
                 b = par[b]
-            
+
             while a != b:
                 c = par[a]
-                if in_path[c]:
-                    del_fn(a, end)
-                    in_path[a] = 0
-                else:
-                    add_fn(c, end)
-                    in_path[c] = 1
+                step(a, c, end)
                 a = c
-            
+
             for i in range(len(path) - 1, -1, -1):
                 c = path[i]
-                if in_path[c]:
-                    del_fn(a, end)
-                    in_path[a] = 0
-                else:
-                    add_fn(c, end)
-                    in_path[c] = 1
+                step(a, c, end)
                 a = c
-            
+
             pos[end] = a
             if end:
                 res[qi] = calc_fn()
-    
+
+    if stats is not None:
+        stats['moves'] = moves[0]
     return res
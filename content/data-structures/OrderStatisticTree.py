@@ -4,26 +4,174 @@
  * License: CC0
  * Source: hacKIT, NWERC 2015
  * Description: A set (not multiset!) with support for finding the n'th
- * element, and finding the index of an element. Python's sortedcontainers
- * library provides similar functionality. Install with: pip install sortedcontainers
- * Time: O(\log N)
+ * element, and finding the index of an element. No dependencies.
+ * If all keys are known in advance, pass them as universe: the set is then a bytearray of
+ * present flags over the sorted keys, with a Fenwick tree over the counts of each chunk of B
+ * keys (ranks inside a chunk are one bytearray.count). Otherwise (or as soon as an unknown key
+ * is added) elements live in sorted blocks of B to 2B keys, with a Fenwick tree over block sizes.
+ * Usage: t = OrderStatisticSet(); t.add(8); t.add(10)
+ * t.rank(9) == 1; t.bisect(10) == 2; t.kth(0) == 8
+ * Time: O(\log N + B) per operation
+ * Status: stress-tested
 """
 
-from sortedcontainers import SortedList
-
-def example():
-    t = SortedList()
-    t.add(8)
-    t.add(10)
-    assert t.bisect_left(9) == 1  # index of first element >= 9
-    assert t.index(10) == 1  # index of element 10
-    assert t.index(8) == 0
-    assert t[0] == 8  # n'th element
-    assert t[1] == 10
-
-# Alternative: Use bisect module with a regular list (requires manual sorting)
-# import bisect
-# t = []
-# bisect.insort(t, 8)
-# bisect.insort(t, 10)
-# idx = bisect.bisect_left(t, 9)
+from bisect import bisect_left, bisect_right
+
+def _fw_add(s, i, d):
+    while i < len(s):
+        s[i] += d
+        i |= i + 1
+
+def _fw_sum(s, i):  # sum of [0, i)
+    res = 0
+    while i > 0:
+        res += s[i - 1]
+        i &= i - 1
+    return res
+
+def _fw_kth(s, k):  # (i, r): first i with sum [0, i] > k, and k - sum [0, i)
+    pos, pw = 0, 1 << len(s).bit_length() >> 1
+    while pw:
+        if pos + pw <= len(s) and s[pos + pw - 1] <= k:
+            pos += pw
+            k -= s[pos - 1]
+        pw >>= 1
+    return pos, k
+
+def _fw_build(a):
+    s = list(a)
+    for i in range(len(s)):
+        j = i | (i + 1)
+        if j < len(s):
+            s[j] += s[i]
+    return s
+
+class OrderStatisticSet:
+    B = 512
+
+    def __init__(self, universe=None):
+        self.n = 0
+        self.keys = None
+        if universe is not None:
+            self.keys = sorted(set(universe))
+            self.idx = {x: i for i, x in enumerate(self.keys)}
+            self.has = bytearray(len(self.keys))
+            self.s = [0] * (len(self.keys) // self.B + 1)
+        else:
+            self._blocks([])
+
+    def _blocks(self, vals):  # switch to sorted blocks holding vals
+        B = self.B
+        self.keys = None
+        self.a = [vals[i:i + B] for i in range(0, len(vals), B)] or [[]]
+        self._reindex()
+
+    def _reindex(self):
+        self.mx = [b[-1] if b else None for b in self.a]
+        self.s = _fw_build(map(len, self.a))
+
+    def _block(self, x):  # index of the block where x belongs
+        return min(bisect_left(self.mx, x), len(self.a) - 1) if self.n else 0
+
+    def __len__(self):
+        return self.n
+
+    def __contains__(self, x):
+        if self.keys is not None:
+            i = self.idx.get(x)
+            return i is not None and self.has[i] == 1
+        b = self.a[self._block(x)]
+        i = bisect_left(b, x)
+        return i < len(b) and b[i] == x
+
+    def __iter__(self):
+        if self.keys is not None:
+            return (x for x, h in zip(self.keys, self.has) if h)
+        return (x for b in self.a for x in b)
+
+    def add(self, x):
+        if self.keys is not None:
+            i = self.idx.get(x)
+            if i is None:
+                self._blocks(list(self))
+            else:
+                if not self.has[i]:
+                    self.has[i] = 1
+                    self.n += 1
+                    _fw_add(self.s, i // self.B, 1)
+                return
+        bi = self._block(x)
+        b = self.a[bi]
+        j = bisect_left(b, x)
+        if j < len(b) and b[j] == x:
+            return
+        b.insert(j, x)
+        self.n += 1
+        if len(b) > 2 * self.B:
+            self.a[bi + 1:bi + 1] = [b[self.B:]]
+            del b[self.B:]
+            self._reindex()
+        else:
+            self.mx[bi] = b[-1]
+            _fw_add(self.s, bi, 1)
+
+    def remove(self, x):  # KeyError if x is not in the set
+        if self.keys is not None:
+            i = self.idx.get(x)
+            if i is None or not self.has[i]:
+                raise KeyError(x)
+            self.has[i] = 0
+            self.n -= 1
+            _fw_add(self.s, i // self.B, -1)
+            return
+        bi = self._block(x)
+        b = self.a[bi]
+        j = bisect_left(b, x)
+        if j == len(b) or b[j] != x:
+            raise KeyError(x)
+        del b[j]
+        self.n -= 1
+        if not b and len(self.a) > 1:
+            del self.a[bi]
+            self._reindex()
+        else:
+            self.mx[bi] = b[-1] if b else None
+            _fw_add(self.s, bi, -1)
+
+    def discard(self, x):
+        if x in self:
+            self.remove(x)
+
+    def _urank(self, i):  # present keys among the first i of the universe
+        B = self.B
+        return _fw_sum(self.s, i // B) + self.has.count(1, i - i % B, i)
+
+    def rank(self, x):  # number of elements < x
+        if self.keys is not None:
+            i = self.idx.get(x)  # a dict hit beats bisecting a big list
+            return self._urank(bisect_left(self.keys, x) if i is None else i)
+        bi = self._block(x)
+        return _fw_sum(self.s, bi) + bisect_left(self.a[bi], x)
+
+    def bisect(self, x):  # number of elements <= x
+        if self.keys is not None:
+            i = self.idx.get(x)
+            return self._urank(bisect_right(self.keys, x) if i is None else i + 1)
+        bi = self._block(x)
+        return _fw_sum(self.s, bi) + bisect_right(self.a[bi], x)
+
+    def kth(self, k):  # k-th smallest element, 0-indexed
+        if not 0 <= k < self.n:
+            raise IndexError(k)
+        i, r = _fw_kth(self.s, k)
+        if self.keys is None:
+            return self.a[i][r]
+        lo, hi = i * self.B, (i + 1) * self.B
+        while hi - lo > 1:  # r-th present key of chunk i, by halving
+            mid = (lo + hi) // 2
+            c = self.has.count(1, lo, mid)
+            if r < c:
+                hi = mid
+            else:
+                r, lo = r - c, mid
+        return self.keys[lo]
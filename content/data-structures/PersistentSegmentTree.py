@@ -0,0 +1,100 @@
+"""
+ * Author: 984-ISHU
+ * Date: 2026-10-18
+ * License: CC0
+ * Source: folklore
+ * Description: Segment tree over [0, N) where every point update creates a new version
+ * sharing all but O(\log N) nodes with the old one. Nodes live in flat arrays; node 0 is
+ * a segment of zeros (its own children), so PersistentSegmentTree(n) starts in O(1).
+ * kth(a, b, k) returns the k-th smallest (0-indexed) position among the counts added
+ * between versions a and b.
+ * Usage: k-th smallest in A[l:r]: compress A to ranks, insert ranks one at a time with
+ * add(i, rank, 1), then kth(l, r, k) is the rank. 2D dominance counting: version i holds the
+ * points with x < i, so query_sum(X, 0, Y) counts points with x < X, y < Y.
+ * Time: O(\log N) per operation.
+ * Memory: 24 bytes per node, O(N + Q \log N) nodes.
+ * Status: stress-tested
+"""
+
+from array import array
+
+class PersistentSegmentTree:
+    def __init__(self, v):
+        self.L, self.R = array('i', [0]), array('i', [0])
+        self.sm, self.mn = array('q', [0]), array('q', [0])
+        if isinstance(v, int):
+            self.n, root = v, 0
+        else:
+            self.n, root = len(v), self._build(v, 0, len(v))
+        self.roots = [root]
+
+    def _node(self, l, r, s, m):
+        self.L.append(l)
+        self.R.append(r)
+        self.sm.append(s)
+        self.mn.append(m)
+        return len(self.L) - 1
+
+    def _build(self, v, lo, hi):
+        if hi - lo == 1:
+            return self._node(0, 0, v[lo], v[lo])
+        mid = (lo + hi) // 2
+        l, r = self._build(v, lo, mid), self._build(v, mid, hi)
+        return self._node(l, r, self.sm[l] + self.sm[r], min(self.mn[l], self.mn[r]))
+
+    def _update(self, ver, pos, val, add):
+        L, R, sm, mn = self.L, self.R, self.sm, self.mn
+        x, lo, hi, path = self.roots[ver], 0, self.n, []
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            path.append((x, pos < mid))
+            if pos < mid:
+                x, hi = L[x], mid
+            else:
+                x, lo = R[x], mid
+        val += sm[x] if add else 0
+        y = self._node(0, 0, val, val)
+        for x, left in reversed(path):
+            l, r = (y, R[x]) if left else (L[x], y)
+            y = self._node(l, r, sm[l] + sm[r], min(mn[l], mn[r]))
+        self.roots.append(y)
+        return len(self.roots) - 1
+
+    def update(self, ver, pos, val):  # a[pos] = val, returns new version
+        return self._update(ver, pos, val, False)
+
+    def add(self, ver, pos, dif):  # a[pos] += dif, returns new version
+        return self._update(ver, pos, dif, True)
+
+    def _query(self, ver, b, e, tot, f):
+        res, st = None, [(self.roots[ver], 0, self.n)]
+        while st:
+            x, lo, hi = st.pop()
+            if e <= lo or hi <= b:
+                continue
+            if b <= lo and hi <= e:
+                res = tot[x] if res is None else f(res, tot[x])
+            else:
+                mid = (lo + hi) // 2
+                st.append((self.R[x], mid, hi))
+                st.append((self.L[x], lo, mid))
+        return res
+
+    def query_sum(self, ver, b, e):  # sum of a[b:e]
+        return self._query(ver, b, e, self.sm, int.__add__) or 0
+
+    def query_min(self, ver, b, e):  # min of a[b:e], None if empty
+        return self._query(ver, b, e, self.mn, min)
+
+    def kth(self, va, vb, k):  # needs nonnegative counts, k < total
+        L, R, sm = self.L, self.R, self.sm
+        a, b, lo, hi = self.roots[va], self.roots[vb], 0, self.n
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            c = sm[L[b]] - sm[L[a]]
+            if k < c:
+                a, b, hi = L[a], L[b], mid
+            else:
+                k -= c
+                a, b, lo = R[a], R[b], mid
+        return lo
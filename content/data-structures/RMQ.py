@@ -5,27 +5,148 @@
  * Source: Folklore
  * Description: Range Minimum Queries on an array. Returns
  * min(V[a], V[a + 1], ... V[b - 1]) in constant time.
+ * With argmin=True, returns the index of the (leftmost) minimum instead, as LCA needs.
+ * With NumPy and 1-D numeric V, levels are built with vectorized np.minimum over shifted
+ * slices and stored back to back in one typed array, so query\_many answers a whole batch in
+ * one pass. Any other comparable values, e.g. (depth, node) pairs, use lists.
+ * BlockRMQ has the same query contract in O(|V|) memory: a sparse table over minima of
+ * blocks of 64, plus for each i a bitmask of the monotonic stack of its block up to i,
+ * so the minimum of [l, i] within a block is at the lowest set bit at or above l.
+ * build\_rmq picks BlockRMQ once the sparse table would get too big; BlockRMQ only has query,
+ * so pass a limit of inf when argmin or query\_many is needed.
  * Usage:
  * rmq = RMQ(values)
  * rmq.query(inclusive, exclusive)
- * Time: O(|V| \log |V| + Q)
+ * rmq.query\_many(a, b) \# arrays of bounds
+ * Time: O(|V| \log |V| + Q), BlockRMQ O(|V| + Q)
  * Status: stress-tested
 """
 
+from operator import index
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _numeric(V):  # V as a 1-D numeric NumPy array, or None to use lists
+    if np is None:
+        return None
+    try:
+        A = np.asarray(V)
+    except (ValueError, TypeError):
+        return None
+    return A if A.ndim == 1 and A.dtype.kind in 'iuf' else None
+
 class RMQ:
-    def __init__(self, V):
-        self.jmp = [V[:]]
+    def __init__(self, V, argmin=False):
+        self.argmin = argmin
+        n = len(V)
+        A = _numeric(V)
+        self.vec = A is not None
+        if A is None:
+            self.V = V
+            cur = list(range(n)) if argmin else V[:]
+            self.jmp = [cur]
+            pw = 1
+            while pw * 2 <= n:
+                if argmin:
+                    cur = [j if V[j] < V[i] else i for i, j in zip(cur, cur[pw:])]
+                else:
+                    cur = [min(x, y) for x, y in zip(cur, cur[pw:])]
+                self.jmp.append(cur)
+                pw *= 2
+            return
+        self.V = V = A
+        cur = np.arange(n) if argmin else V.copy()
+        levels = [cur]
         pw = 1
-        k = 1
-        while pw * 2 <= len(V):
-            self.jmp.append([0] * (len(V) - pw * 2 + 1))
-            for j in range(len(self.jmp[k])):
-                self.jmp[k][j] = min(self.jmp[k - 1][j], 
-                                     self.jmp[k - 1][j + pw])
+        while pw * 2 <= n:
+            x, y = cur[:n - 2 * pw + 1], cur[pw:]
+            cur = np.where(V[y] < V[x], y, x) if argmin else np.minimum(x, y)
+            levels.append(cur)
             pw *= 2
-            k += 1
-    
+        self.off = np.cumsum([0] + [len(l) for l in levels])
+        self.flat = np.concatenate(levels)
+        self.jmp = [self.flat[self.off[k]:self.off[k + 1]] for k in range(len(levels))]
+
     def query(self, a, b):
+        a, b = index(a), index(b)  # bounds may be NumPy integers
         assert a < b  # or return inf if a == b
         dep = (b - a).bit_length() - 1
-        return min(self.jmp[dep][a], self.jmp[dep][b - (1 << dep)])
+        x, y = self.jmp[dep][a], self.jmp[dep][b - (1 << dep)]
+        res = (y if self.V[y] < self.V[x] else x) if self.argmin else min(x, y)
+        return res.item() if self.vec else res
+
+    def query_many(self, a, b):  # all a < b
+        if not self.vec:
+            return [self.query(x, y) for x, y in zip(a, b)]
+        a, b = np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64)
+        dep = np.frexp(b - a)[1] - 1
+        x = self.flat[self.off[dep] + a]
+        y = self.flat[self.off[dep] + b - (1 << dep)]
+        if self.argmin:
+            return np.where(self.V[y] < self.V[x], y, x)
+        return np.minimum(x, y)
+
+class BlockRMQ:
+    B = 64
+
+    def __init__(self, V):
+        B, n = self.B, len(V)
+        A = _numeric(V)
+        self.vec = A is not None
+        self.V = V
+        if A is None:
+            self.mask = mask = [0] * n
+            for bs in range(0, n, B):
+                cur, stk = 0, []
+                for i in range(bs, min(bs + B, n)):
+                    while stk and V[stk[-1]] > V[i]:
+                        cur ^= 1 << (stk.pop() - bs)
+                    stk.append(i)
+                    cur |= 1 << (i - bs)
+                    mask[i] = cur
+            self.blk = RMQ([min(V[i:i + B]) for i in range(0, n, B)])
+            return
+        self.V = V = A
+        nb = -(-n // B)
+        W = np.concatenate((V, np.full(nb * B - n, V.max(initial=0), V.dtype))).reshape(nb, B)
+        rows = np.arange(nb)
+        stk = np.zeros((nb, B), np.uint8)
+        sp = np.zeros(nb, np.int64)
+        cur = np.zeros(nb, np.uint64)
+        mask = np.empty((nb, B), np.uint64)
+        for k in range(B):  # all blocks in lockstep
+            x, act = W[:, k], rows[sp > 0]
+            while len(act):
+                top = stk[act, sp[act] - 1]
+                pop = W[act, top] > x[act]
+                act, top = act[pop], top[pop]
+                cur[act] &= ~(np.uint64(1) << top.astype(np.uint64))
+                sp[act] -= 1
+                act = act[sp[act] > 0]
+            stk[rows, sp] = k
+            sp += 1
+            cur |= np.uint64(1 << k)
+            mask[:, k] = cur
+        self.mask = mask.ravel()[:n]
+        self.blk = RMQ(W.min(axis=1))
+
+    def _min(self, l, r):  # l, r in the same block, inclusive
+        m = int(self.mask[r]) >> (l % self.B)
+        res = self.V[l + (m & -m).bit_length() - 1]
+        return res.item() if self.vec else res
+
+    def query(self, a, b):
+        assert a < b
+        B, r = self.B, b - 1
+        if a // B == r // B:
+            return self._min(a, r)
+        res = min(self._min(a, a | (B - 1)), self._min(r - r % B, r))
+        if a // B + 1 < r // B:
+            res = min(res, self.blk.query(a // B + 1, r // B))
+        return res
+
+def build_rmq(V, limit=1 << 22):  # past limit: BlockRMQ, which has only query (no argmin, query_many)
+    return RMQ(V) if len(V) <= limit else BlockRMQ(V)
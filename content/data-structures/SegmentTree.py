@@ -3,39 +3,89 @@
  * Date: 2017-10-31
  * License: CC0
  * Source: folklore
- * Description: Zero-indexed max-tree. Bounds are inclusive to the left and exclusive to the right.
- * Can be changed by modifying T, f and unit.
- * Time: O(\log N)
+ * Description: Zero-indexed segment tree over a monoid. Bounds are inclusive to the left and exclusive to the right.
+ * op is one of 'max' (default), 'min', 'sum', 'gcd', 'xor', or any associative callable together
+ * with its unit. Subclasses can override f and unit instead.
+ * Built-in ops map to C-level functions, so combining never enters a Python frame.
+ * Pass an iterable instead of n to build in O(N).
+ * Usage: st = SegmentTree([5, 1, 4], op='min'); st.query(0, 2) \# 1
+ * st = SegmentTree(n, op=lambda a, b: a * b % mod, unit=1)
+ * Time: O(\log N) per operation, O(N) to build, O(K \log N) for update\_many.
  * Status: stress-tested
 """
 
+from math import gcd
+from operator import add, index, xor
+
+MONOIDS = {
+    'max': (max, float('-inf')),
+    'min': (min, float('inf')),
+    'sum': (add, 0),
+    'gcd': (gcd, 0),
+    'xor': (xor, 0),
+}
+
 class SegmentTree:
-    def __init__(self, n, def_val=float('-inf')):
-        self.n = n
-        self.unit = float('-inf')
-        self.s = [def_val] * (2 * n)
-    
-    def f(self, a, b):  # any associative fn
+    unit = float('-inf')
+
+    def f(self, a, b):  # any associative fn, or pass op
         return max(a, b)
-    
+
+    def __init__(self, n, def_val=None, op=None, unit=None):
+        if callable(op) and unit is None:
+            raise ValueError("a callable op needs its unit")
+        if op is not None:
+            self.f, self.unit = (op, unit) if callable(op) else MONOIDS[op]
+        elif type(self).f is SegmentTree.f:
+            self.f = max  # same as f, without the Python frame
+        if def_val is None:
+            def_val = self.unit
+        try:
+            v = [def_val] * index(n)
+        except TypeError:
+            v = list(n)
+        self.n = n = len(v)
+        self.s = s = [self.unit] * n + v
+        f = self.f
+        for i in range(n - 1, 0, -1):
+            s[i] = f(s[2 * i], s[2 * i + 1])
+
     def update(self, pos, val):
+        s, f = self.s, self.f
         pos += self.n
-        self.s[pos] = val
+        s[pos] = val
         while pos > 1:
             pos //= 2
-            self.s[pos] = self.f(self.s[pos * 2], self.s[pos * 2 + 1])
-    
+            s[pos] = f(s[pos * 2], s[pos * 2 + 1])
+
     def query(self, b, e):  # query [b, e)
-        ra, rb = self.unit, self.unit
+        s, f = self.s, self.f
+        ra = rb = self.unit
         b += self.n
         e += self.n
         while b < e:
             if b % 2:
-                ra = self.f(ra, self.s[b])
+                ra = f(ra, s[b])
                 b += 1
             if e % 2:
                 e -= 1
-                rb = self.f(self.s[e], rb)
+                rb = f(s[e], rb)
             b //= 2
             e //= 2
-        return self.f(ra, rb)
+        return f(ra, rb)
+
+    def update_many(self, positions, vals):
+        # Shared ancestors are recomputed once, children before parents.
+        s, f, n = self.s, self.f, self.n
+        todo = set()
+        for pos, val in zip(positions, vals):
+            s[pos + n] = val
+            pos = (pos + n) // 2
+            while pos and pos not in todo:
+                todo.add(pos)
+                pos //= 2
+        for i in sorted(todo, reverse=True):
+            s[i] = f(s[2 * i], s[2 * i + 1])
+
+    def query_many(self, bs, es):
+        return [self.query(b, e) for b, e in zip(bs, es)]
@@ -4,22 +4,66 @@
  * License: CC0
  * Source: Folklore
  * Description: Calculate submatrix sums quickly, given upper-left and lower-right corners (half-open).
+ * With NumPy and numeric input, the prefix table is a typed 2D array (int64, or float64 for
+ * float input) built with cumulative sums over chunks of rows, so v can be a np.memmap of a
+ * binary file. Other input, e.g. Python ints past int64, keeps lists. Pass path
+ * to store the table in a .npy file instead; SubMatrix.load(path) maps it read-only from any
+ * process without recomputing. sum\_many answers arrays of rectangles at once.
  * Usage:
  * m = SubMatrix(matrix)
  * m.sum(0, 0, 2, 2)  \# top left 4 elements
+ * m = SubMatrix(np.memmap('grid.bin', np.uint8, 'r', shape=(R, C)), path='grid.npy')
+ * m = SubMatrix.load('grid.npy'); m.sum\_many(U, L, D, R)
  * Time: O(N^2 + Q)
  * Status: Tested on Kattis
 """
 
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 class SubMatrix:
-    def __init__(self, v):
+    def __init__(self, v, dtype=None, path=None, chunk=1 << 20):
         R = len(v)
         C = len(v[0]) if R > 0 else 0
-        self.p = [[0] * (C + 1) for _ in range(R + 1)]
-        for r in range(R):
-            for c in range(C):
-                self.p[r + 1][c + 1] = (v[r][c] + self.p[r][c + 1] + 
-                                        self.p[r + 1][c] - self.p[r][c])
-    
+        a = None if np is None else np.asarray(v)
+        if a is None or a.dtype.kind not in 'biuf':  # e.g. Python ints past int64
+            if path is not None:
+                raise ValueError("path needs a numeric (NumPy) table")
+            self.p = [[0] * (C + 1)]
+            for row in v:
+                self.p.append([a + b for a, b in zip(self.p[-1], accumulate(row, initial=0))])
+            return
+        dtype = dtype or (np.float64 if a.dtype.kind == 'f' else np.int64)
+        if path is None:
+            self.p = np.zeros((R + 1, C + 1), dtype)
+        else:
+            self.p = np.lib.format.open_memmap(path, 'w+', dtype, (R + 1, C + 1))
+            self.p[0] = self.p[:, 0] = 0
+        rows = max(1, chunk // max(C, 1))  # about chunk cells at a time
+        for i in range(0, R, rows):
+            blk = np.cumsum(a[i:i + rows], axis=1, dtype=dtype)
+            np.cumsum(blk, axis=0, out=blk)
+            blk += self.p[i, 1:]
+            self.p[i + 1:i + 1 + len(blk), 1:] = blk
+        if path is not None:
+            self.p.flush()
+
+    @classmethod
+    def load(cls, path):  # table written by SubMatrix(v, path=path)
+        m = cls.__new__(cls)
+        m.p = np.load(path, mmap_mode='r')
+        return m
+
     def sum(self, u, l, d, r):
         return self.p[d][r] - self.p[d][l] - self.p[u][r] + self.p[u][l]
+
+    def sum_many(self, u, l, d, r):  # arrays of rectangles
+        if np is None or isinstance(self.p, list):
+            return [self.sum(*q) for q in zip(u, l, d, r)]
+        p = self.p
+        u, l, d, r = (np.asarray(x, dtype=np.int64) for x in (u, l, d, r))
+        return p[d, r] - p[d, l] - p[u, r] + p[u, l]
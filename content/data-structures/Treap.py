@@ -5,69 +5,210 @@
  * Description: A short self-balancing tree. It acts as a
  * sequential container with log-time splits/joins, and
  * is easy to augment with additional data.
+ * Nodes are indices into parallel arrays (l, r, y = priority, c = size, val); 0 is the
+ * empty tree. split and merge are iterative and use node 0 as a scratch parent, so
+ * there is no recursion limit. build makes a treap of a sequence in O(N).
+ * Unlike the C++ version (and older versions of this file), Node, split, merge, ins and move
+ * are methods of Treap rather than free functions, and each(n) is a generator of the values
+ * instead of taking a callback.
+ * LazyTreap adds range add, range reverse and range aggregates in O(\log N): push(n) applies
+ * the tags of n to its children and is called before any walk reads them. The aggregate is
+ * pluggable: op, its unit, and apply(agg, x, cnt) = aggregate after adding x to cnt values.
+ * A callable op need not be commutative: ragg keeps each aggregate in reverse order too, and
+ * a reversal swaps the two.
+ * Usage: tr = Treap(); t = tr.build(range(10**6)); a, b = tr.split(t, 5)
+ * t = tr.merge(b, a); list(tr.each(t))
+ * tr = LazyTreap('min'); t = tr.build(v); t = tr.reverse(t, 2, 7); t, m = tr.query(t, 0, 4)
  * Time: O(\log N)
+ * Memory: 16 bytes per node plus a list slot for its value.
  * Status: stress-tested
 """
 
 import random
+from array import array
+from operator import add
 
-class Node:
-    def __init__(self, val):
-        self.l = None
-        self.r = None
-        self.val = val
-        self.y = random.randint(0, 2**31 - 1)
-        self.c = 1
-    
-    def recalc(self):
-        self.c = cnt(self.l) + cnt(self.r) + 1
-
-def cnt(n):
-    return n.c if n else 0
-
-def each(n, f):
-    if n:
-        each(n.l, f)
-        f(n.val)
-        each(n.r, f)
-
-def split(n, k):
-    if not n:
-        return None, None
-    if cnt(n.l) >= k:  # Use "n.val >= k" for lower_bound(k)
-        L, R = split(n.l, k)
-        n.l = R
-        n.recalc()
-        return L, n
-    else:
-        L, R = split(n.r, k - cnt(n.l) - 1)
-        n.r = L
-        n.recalc()
-        return n, R
-
-def merge(l, r):
-    if not l:
-        return r
-    if not r:
-        return l
-    if l.y > r.y:
-        l.r = merge(l.r, r)
-        l.recalc()
-        return l
-    else:
-        r.l = merge(l, r.l)
-        r.recalc()
-        return r
-
-def ins(t, n, pos):
-    l, r = split(t, pos)
-    return merge(merge(l, n), r)
-
-def move(t, l_pos, r_pos, k):
-    # Move the range [l_pos, r_pos) to index k
-    a, b = split(t, l_pos)
-    b, c = split(b, r_pos - l_pos)
-    if k <= l_pos:
-        return merge(ins(a, b, k), c)
-    else:
-        return merge(a, ins(c, b, k - r_pos))
+class Treap:
+    def __init__(self):
+        self.l, self.r = array('i', [0]), array('i', [0])
+        self.y, self.c = array('i', [0]), array('i', [0])
+        self.val = [None]
+
+    def node(self, val):
+        self.l.append(0)
+        self.r.append(0)
+        self.y.append(random.getrandbits(31))
+        self.c.append(1)
+        self.val.append(val)
+        return len(self.val) - 1
+
+    def push(self, n):  # lazy tags go here, see LazyTreap
+        pass
+
+    def recalc(self, n):
+        self.c[n] = self.c[self.l[n]] + self.c[self.r[n]] + 1
+
+    def build(self, vals):  # Cartesian tree by priority, sizes fixed when popped
+        l, r, y = self.l, self.r, self.y
+        st = []
+        for v in vals:
+            n, last = self.node(v), 0
+            while st and y[st[-1]] < y[n]:
+                last = st.pop()
+                self.recalc(last)
+            l[n] = last
+            if st:
+                r[st[-1]] = n
+            st.append(n)
+        root = st[0] if st else 0
+        while st:
+            self.recalc(st.pop())
+        return root
+
+    def each(self, n):  # in-order generator over values
+        st = []
+        while st or n:
+            while n:
+                self.push(n)
+                st.append(n)
+                n = self.l[n]
+            n = st.pop()
+            yield self.val[n]
+            n = self.r[n]
+
+    def split(self, n, k):  # first k nodes, rest
+        l, r, c = self.l, self.r, self.c
+        path = []
+        lo = hi = 0  # last node of the left part / first of the right part
+        while n:
+            self.push(n)
+            path.append(n)
+            if c[l[n]] >= k:  # Use "self.val[n] >= k" for lower_bound(k)
+                l[hi] = n
+                hi, n = n, l[n]
+            else:
+                k -= c[l[n]] + 1
+                r[lo] = n
+                lo, n = n, r[n]
+        a, b = r[0], l[0]
+        l[hi] = r[lo] = r[0] = l[0] = 0
+        for n in reversed(path):
+            self.recalc(n)
+        return a, b
+
+    def merge(self, a, b):
+        l, r, y = self.l, self.r, self.y
+        path = []
+        p, right = 0, True  # attach the next node at r[p] or l[p]
+        while a and b:
+            if y[a] > y[b]:
+                self.push(a)
+                n, a, side = a, r[a], True
+            else:
+                self.push(b)
+                n, b, side = b, l[b], False
+            if right:
+                r[p] = n
+            else:
+                l[p] = n
+            path.append(n)
+            p, right = n, side
+        if right:
+            r[p] = a or b
+        else:
+            l[p] = a or b
+        res, r[0] = r[0], 0
+        for n in reversed(path):
+            self.recalc(n)
+        return res
+
+    def ins(self, t, n, pos):
+        a, b = self.split(t, pos)
+        return self.merge(self.merge(a, n), b)
+
+    def move(self, t, l_pos, r_pos, k):
+        # Move the range [l_pos, r_pos) to index k
+        a, b = self.split(t, l_pos)
+        b, c = self.split(b, r_pos - l_pos)
+        if k <= l_pos:
+            return self.merge(self.ins(a, b, k), c)
+        else:
+            return self.merge(a, self.ins(c, b, k - r_pos))
+
+MONOIDS = {
+    'sum': (add, 0, lambda agg, x, cnt: agg + x * cnt),
+    'min': (min, float('inf'), lambda agg, x, cnt: agg + x),
+    'max': (max, float('-inf'), lambda agg, x, cnt: agg + x),
+}
+
+class LazyTreap(Treap):
+    def __init__(self, op='sum', unit=None, apply=None):
+        super().__init__()
+        self.f, self.unit, self.fa = (op, unit, apply) if callable(op) else MONOIDS[op]
+        self.agg, self.tag, self.rev = [self.unit], [0], array('b', [0])
+        self.ragg = [self.unit] if callable(op) else None  # aggregate of the reversed range
+
+    def node(self, val):
+        self.agg.append(val)
+        self.tag.append(0)
+        self.rev.append(0)
+        if self.ragg is not None:
+            self.ragg.append(val)
+        return super().node(val)
+
+    def _apply(self, n, x, flip):  # n's own val/agg take x now, its children later
+        agg, ragg = self.agg, self.ragg
+        if x:
+            self.val[n] += x
+            agg[n] = self.fa(agg[n], x, self.c[n])
+            self.tag[n] += x
+            if ragg is not None:
+                ragg[n] = self.fa(ragg[n], x, self.c[n])
+        if flip:
+            self.rev[n] ^= 1
+            if ragg is not None:
+                agg[n], ragg[n] = ragg[n], agg[n]
+
+    def push(self, n):
+        x, flip = self.tag[n], self.rev[n]
+        if x or flip:
+            l, r, c, val, agg, tag, rev = self.l, self.r, self.c, self.val, self.agg, self.tag, self.rev
+            ragg = self.ragg
+            if flip:
+                l[n], r[n] = r[n], l[n]
+            for ch in (l[n], r[n]):
+                if ch and x:
+                    val[ch] += x
+                    agg[ch] = self.fa(agg[ch], x, c[ch])
+                    tag[ch] += x
+                    if ragg is not None:
+                        ragg[ch] = self.fa(ragg[ch], x, c[ch])
+                if ch and flip:
+                    rev[ch] ^= 1
+                    if ragg is not None:
+                        agg[ch], ragg[ch] = ragg[ch], agg[ch]
+            tag[n] = rev[n] = 0
+
+    def recalc(self, n):
+        f, agg, l, r = self.f, self.agg, self.l[n], self.r[n]
+        self.c[n] = self.c[l] + self.c[r] + 1
+        agg[n] = f(f(agg[l], self.val[n]), agg[r])
+        if self.ragg is not None:
+            self.ragg[n] = f(f(self.ragg[r], self.val[n]), self.ragg[l])
+
+    def _range(self, t, lo, hi, x, flip):
+        a, b = self.split(t, lo)
+        b, c = self.split(b, hi - lo)
+        if b:
+            self._apply(b, x, flip)
+        res = self.agg[b]
+        return self.merge(self.merge(a, b), c), res
+
+    def add(self, t, lo, hi, x):  # returns new root
+        return self._range(t, lo, hi, x, 0)[0]
+
+    def reverse(self, t, lo, hi):  # returns new root
+        return self._range(t, lo, hi, 0, 1)[0]
+
+    def query(self, t, lo, hi):  # returns new root, aggregate of [lo, hi)
+        return self._range(t, lo, hi, 0, 0)
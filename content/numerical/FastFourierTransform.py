@@ -8,72 +8,133 @@
  * For convolution of complex numbers or more than two vectors: FFT, multiply
  * pointwise, divide by n, reverse(start+1, end), FFT back.
  * Rounding is safe if $(\sum a_i^2 + \sum b_i^2)\log_2{N} < 9\cdot10^{14}$
- * (in practice $10^{16}$; higher for random inputs).
+ * (in practice $10^{16}$, also with NumPy at $N = 2^{20}$; higher for random inputs).
  * Otherwise, use NTT/FFTMod.
+ * The swaps and roots for each size are an FFTPlan, kept in an LRU cache (get\_plan) and
+ * reused by every fft, conv and fft\_conv\_mod call of that size. With NumPy, each stage is
+ * one complex128 butterfly over the array viewed as (blocks, 2, k), and conv takes and
+ * returns arrays (lists still work).
  * Time: O(N log N) with N = |A|+|B|
  * Status: somewhat tested
 """
 
 import cmath
-import math
+from array import array
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class FFTPlan:
+    """
+    Bit-reversal swaps and roots of unity for size n, in typed arrays.
+    Roots are computed directly, rt[k + j] = exp(i pi j / k), so errors do not accumulate.
+    With NumPy, also the permutation perm and roots w as arrays for the vectorized path.
+    """
+    def __init__(self, n):
+        self.n = n
+        L = n.bit_length() - 1
+        if np is not None:
+            i = np.arange(n)
+            self.perm = np.zeros(n, np.int64)
+            for b in range(L):
+                self.perm |= (i >> b & 1) << (L - 1 - b)
+            self.w = np.ones(n, np.complex128)
+            k = 1
+            while k < n:
+                self.w[k:2 * k] = np.exp(1j * np.pi * np.arange(k) / k)
+                k *= 2
+            i = np.flatnonzero(i < self.perm)
+            self.si, self.sj = array('i', i.tolist()), array('i', self.perm[i].tolist())
+            self.re, self.im = array('d', self.w.real.tolist()), array('d', self.w.imag.tolist())
+            return
+        rev = [0] * n
+        for i in range(1, n):
+            rev[i] = (rev[i // 2] | (i & 1) << L) // 2
+        rt = [complex(1)] * n
+        k = 1
+        while k < n:
+            for j in range(k):
+                rt[k + j] = cmath.exp(1j * cmath.pi * j / k)
+            k *= 2
+        self.si = array('i', (i for i in range(n) if i < rev[i]))
+        self.sj = array('i', (rev[i] for i in self.si))
+        self.re = array('d', (z.real for z in rt))
+        self.im = array('d', (z.imag for z in rt))
+
+    def fft(self, a):
+        n = self.n
+        if np is not None and isinstance(a, np.ndarray):
+            if a.dtype != np.complex128 or not a.flags.c_contiguous:
+                raise TypeError("fft works in place on a contiguous complex128 array")
+            a[:] = a[self.perm]
+            k = 1
+            while k < n:  # butterflies of all blocks of size 2k at once
+                A = a.reshape(-1, 2, k)
+                z = A[:, 1] * self.w[k:2 * k]
+                A[:, 1] = A[:, 0] - z
+                A[:, 0] += z
+                k *= 2
+            return
+        for i, j in zip(self.si, self.sj):
+            a[i], a[j] = a[j], a[i]
+        re, im = self.re, self.im
+        k = 1
+        while k < n:
+            for j in range(k):
+                w = complex(re[k + j], im[k + j])
+                for i in range(j, n, 2 * k):
+                    z = w * a[i + k]
+                    a[i + k] = a[i] - z
+                    a[i] += z
+            k *= 2
+
+@lru_cache(maxsize=32)
+def get_plan(n):
+    return FFTPlan(n)
 
 def fft(a):
     """
     Compute Fast Fourier Transform in-place.
     
     Args:
-        a: List of complex numbers (length must be power of 2)
+        a: List of complex numbers, or contiguous complex128 NumPy array (else TypeError)
+           (length must be power of 2)
     """
-    n = len(a)
-    if n <= 1:
-        return
-    
-    L = n.bit_length() - 1
-    
-    # Initialize roots of unity (cached)
-    if not hasattr(fft, 'rt') or len(fft.rt) < n:
-        fft.rt = [1] * n
-        k = 2
-        while k < n:
-            x = cmath.exp(1j * cmath.pi / k)
-            for i in range(k, 2 * k):
-                fft.rt[i] = fft.rt[i // 2] * x if i & 1 else fft.rt[i // 2]
-            k *= 2
-    
-    # Bit-reversal permutation
-    rev = [0] * n
-    for i in range(n):
-        rev[i] = (rev[i // 2] | (i & 1) << L) // 2
-        if i < rev[i]:
-            a[i], a[rev[i]] = a[rev[i]], a[i]
-    
-    # Cooley-Tukey FFT
-    k = 1
-    while k < n:
-        for i in range(0, n, 2 * k):
-            for j in range(k):
-                z = fft.rt[j + k] * a[i + j + k]
-                a[i + j + k] = a[i + j] - z
-                a[i + j] += z
-        k *= 2
+    if len(a) > 1:
+        get_plan(len(a)).fft(a)
 
 def conv(a, b):
     """
     Compute convolution of two sequences using FFT.
     
     Args:
-        a, b: Lists of real numbers
+        a, b: Lists or NumPy arrays of real numbers
     
     Returns:
-        List where res[x] = sum(a[i] * b[x-i])
+        List where res[x] = sum(a[i] * b[x-i]), a float64 array if a or b is an array
     """
-    if not a or not b:
-        return []
+    is_arr = np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray))
+    if not len(a) or not len(b):
+        return np.zeros(0) if is_arr else []
     
     res_size = len(a) + len(b) - 1
     L = (res_size - 1).bit_length()
     n = 1 << L
     
+    if np is not None:
+        in_arr = np.zeros(n, np.complex128)
+        in_arr.real[:len(a)] = a
+        in_arr.imag[:len(b)] = b
+        fft(in_arr)
+        in_arr *= in_arr
+        out = in_arr[-np.arange(n) & (n - 1)] - in_arr.conj()
+        fft(out)
+        res = out.imag[:res_size] / (4 * n)
+        return res if is_arr else res.tolist()
+    
     # Pack a and b into complex array
     in_arr = [complex(a[i] if i < len(a) else 0, 
                      b[i] if i < len(b) else 0) for i in range(n)]
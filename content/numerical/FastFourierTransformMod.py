@@ -5,26 +5,33 @@
  * Source: http://neerc.ifmo.ru/trains/toulouse/2017/fft2.pdf
  * Description: Higher precision FFT, can be used for convolutions modulo arbitrary integers
  * as long as $N\log_2N\cdot \text{mod} < 8.6 \cdot 10^{14}$ (in practice $10^{16}$ or higher).
- * Inputs must be in $[0, \text{mod})$.
+ * Inputs must be in $[0, \text{mod})$. With NumPy, the whole pipeline runs on arrays.
  * Time: O(N log N), where N = |A|+|B| (twice as slow as NTT or FFT)
  * Status: stress-tested
 """
 
 import cmath
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def fft_conv_mod(a, b, mod):
     """
     Convolve two sequences modulo an arbitrary integer using FFT.
     
     Args:
-        a, b: Lists of integers in [0, mod)
+        a, b: Lists or NumPy arrays of integers in [0, mod)
         mod: Modulus
     
     Returns:
-        Convolution result modulo mod
+        Convolution result modulo mod (if a or b is an array: an int64 array,
+        or an object array when mod > 2^63)
     """
-    if not a or not b:
-        return []
+    isarr = np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray))
+    if not len(a) or not len(b):
+        return np.zeros(0, np.int64) if isarr else []
     
     from FastFourierTransform import fft
     
@@ -33,6 +40,28 @@ def fft_conv_mod(a, b, mod):
     n = 1 << B
     cut = int(mod ** 0.5) + 1
     
+    if np is not None:
+        a, b = np.asarray(a, np.int64), np.asarray(b, np.int64)
+        L, R = np.zeros(n, np.complex128), np.zeros(n, np.complex128)
+        L.real[:len(a)], L.imag[:len(a)] = a // cut, a % cut
+        R.real[:len(b)], R.imag[:len(b)] = b // cut, b % cut
+        fft(L)
+        fft(R)
+        j = -np.arange(n) & (n - 1)
+        outl, outs = np.empty(n, np.complex128), np.empty(n, np.complex128)
+        outl[j] = (L + L[j].conj()) * R / (2.0 * n)
+        outs[j] = (L - L[j].conj()) * R / (2.0 * n) / 1j
+        fft(outl)
+        fft(outs)
+        av = np.rint(outl.real[:res_len]).astype(np.int64)
+        bv = np.rint(outl.imag[:res_len]).astype(np.int64) + np.rint(outs.real[:res_len]).astype(np.int64)
+        cv = np.rint(outs.imag[:res_len]).astype(np.int64)
+        if mod * cut < 1 << 61:
+            res = ((av % mod * cut + bv) % mod * cut + cv) % mod
+            return res if isarr else res.tolist()
+        res = [((x % mod * cut + y) % mod * cut + z) % mod for x, y, z in zip(av.tolist(), bv.tolist(), cv.tolist())]
+        return np.array(res, dtype=np.int64 if mod <= 1 << 63 else object) if isarr else res
+    
     # Split numbers into high and low parts
     L = [complex(a[i] // cut if i < len(a) else 0, 
                  a[i] % cut if i < len(a) else 0) for i in range(n)]
@@ -0,0 +1,82 @@
+"""
+ * Author: Simon Lindholm
+ * License: CC0
+ * Description: Add and remove intervals from a set of disjoint intervals.
+ * Will merge the added interval with any overlapping intervals in the set when adding.
+ * Intervals are [inclusive, exclusive).
+ * Starts and ends are kept in parallel sorted blocks of B to 2B intervals (mx is the last end of
+ * each block), standing in for the C++ set; covered is the total length of the intervals.
+ * Usage: ic = IntervalContainer(); ic.add\_interval(0, 5); ic.remove\_interval(1, 2)
+ * list(ic) \# [(0, 1), (2, 5)]; ic.covered \# 4
+ * Time: O(\log N + B) amortized
+ * Status: stress-tested
+"""
+
+from bisect import bisect_left, bisect_right
+
+class IntervalContainer:
+    B = 256
+
+    def __init__(self):
+        self.L, self.R, self.mx = [], [], []
+        self.n = self.covered = 0
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        for Lb, Rb in zip(self.L, self.R):
+            yield from zip(Lb, Rb)
+
+    def _erase(self, bi, j):  # returns position of the next interval
+        Lb, Rb = self.L[bi], self.R[bi]
+        self.covered -= Rb[j] - Lb[j]
+        self.n -= 1
+        del Lb[j], Rb[j]
+        if not Lb:
+            del self.L[bi], self.R[bi], self.mx[bi]
+            return bi, 0
+        self.mx[bi] = Rb[-1]
+        return (bi, j) if j < len(Lb) else (bi + 1, 0)
+
+    def _insert(self, bi, j, l, r):
+        if bi == len(self.L):
+            if not self.L:
+                self.L.append([]), self.R.append([]), self.mx.append(r)
+            bi -= 1
+            j = len(self.L[bi])
+        Lb, Rb, B = self.L[bi], self.R[bi], self.B
+        Lb.insert(j, l)
+        Rb.insert(j, r)
+        self.covered += r - l
+        self.n += 1
+        self.mx[bi] = Rb[-1]
+        if len(Lb) > 2 * B:
+            self.L.insert(bi + 1, Lb[B:])
+            self.R.insert(bi + 1, Rb[B:])
+            del Lb[B:], Rb[B:]
+            self.mx.insert(bi, Rb[-1])
+
+    def add_interval(self, l, r):  # returns the merged interval containing [l, r)
+        if l == r:
+            return None
+        bi = bisect_left(self.mx, l)  # first interval with end >= l
+        j = bisect_left(self.R[bi], l) if bi < len(self.mx) else 0
+        while bi < len(self.L) and self.L[bi][j] <= r:
+            l, r = min(l, self.L[bi][j]), max(r, self.R[bi][j])
+            bi, j = self._erase(bi, j)
+        self._insert(bi, j, l, r)
+        return l, r
+
+    def remove_interval(self, l, r):
+        if l == r:
+            return
+        bi = bisect_right(self.mx, l)  # first interval with end > l
+        j = bisect_right(self.R[bi], l) if bi < len(self.mx) else 0
+        keep = []
+        while bi < len(self.L) and self.L[bi][j] < r:
+            a, b = self.L[bi][j], self.R[bi][j]
+            keep += [(a, l)] * (a < l) + [(r, b)] * (r < b)
+            bi, j = self._erase(bi, j)
+        for a, b in keep:
+            self.add_interval(a, b)
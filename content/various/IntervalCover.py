@@ -0,0 +1,25 @@
+"""
+ * Author: Johan Sannemo
+ * License: CC0
+ * Description: Compute indices of smallest set of intervals covering another interval.
+ * Intervals should be [inclusive, exclusive). To support [inclusive, inclusive],
+ * change (A) to add \texttt{or not R}. Returns empty list on failure (or if G is empty).
+ * Usage: interval\_cover((0, 10), [(0, 4), (3, 8), (2, 6), (7, 10)]) \# [0, 1, 3]
+ * Time: O(N \log N)
+ * Status: stress-tested; the C++ version is tested on kattis:intervalcover
+"""
+
+def interval_cover(G, I):
+    S = sorted(range(len(I)), key=I.__getitem__)
+    R = []
+    cur, at = G[0], 0
+    while cur < G[1]:  # (A)
+        mx = (cur, -1)
+        while at < len(I) and I[S[at]][0] <= cur:
+            mx = max(mx, (I[S[at]][1], S[at]))
+            at += 1
+        if mx[1] == -1:
+            return []
+        cur = mx[0]
+        R.append(mx[1])
+    return R
@@ -5,7 +5,7 @@ DIR=${1:-.}
 g++ -Wall -Wfatal-errors -Wconversion -std=c++17 -O2 $DIR/stress-tests/utilities/template.h
 trap "rm -f $DIR/stress-tests/utilities/template.h.gch" EXIT
 
-tests="$(find $DIR/stress-tests -name '*.cpp')"
+tests="$(find $DIR/stress-tests -name '*.cpp' -o -name '*.py')"
 declare -i pass=0
 declare -i fail=0
 failTests=""
@@ -13,7 +13,11 @@ ulimit -s 524288 # For 2-sat test
 for test in $tests; do
     echo "$(basename $test): "
     start=`date +%s.%N`
-    g++ -Wall -Wfatal-errors -Wconversion -std=c++17 -O2 $test && ./a.out
+    if [[ $test == *.py ]]; then
+        python3 $test
+    else
+        g++ -Wall -Wfatal-errors -Wconversion -std=c++17 -O2 $test && ./a.out
+    fi
     retCode=$?
     if (($retCode != 0)); then
         echo "Failed with $retCode"
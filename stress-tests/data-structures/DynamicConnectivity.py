@@ -0,0 +1,43 @@
+import os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from DynamicConnectivity import DynamicConnectivity
+
+def components(n, edges):  # union-find from scratch
+    p = list(range(n))
+    def find(x):
+        while p[x] != x:
+            x = p[x]
+        return x
+    for u, v in edges:
+        p[find(u)] = find(v)
+    return [find(x) for x in range(n)]
+
+def main():
+    assert DynamicConnectivity(3).solve() == []  # empty timeline
+    for it in range(3000):
+        n = random.randint(1, 8)
+        dc, edges, ref = DynamicConnectivity(n), [], []
+        for _ in range(random.randint(0, 40)):
+            r = random.random()
+            if r < 0.35:
+                u, v = random.randrange(n), random.randrange(n)  # self-loops and multi-edges too
+                if random.random() < 0.3 and edges:
+                    u, v = random.choice(edges)
+                dc.add(u, v)
+                edges.append((u, v))
+            elif r < 0.55 and edges:
+                u, v = edges.pop(random.randrange(len(edges)))
+                dc.remove(*random.choice([(u, v), (v, u)]))
+            elif r < 0.85:
+                u, v = random.randrange(n), random.randrange(n)
+                dc.connected(u, v)
+                c = components(n, edges)
+                ref.append(c[u] == c[v])
+            else:
+                dc.count()
+                ref.append(len(set(components(n, edges))))
+        assert dc.solve() == ref
+    print("Tests passed!")
+
+main()
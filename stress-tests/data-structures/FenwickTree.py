@@ -0,0 +1,82 @@
+import os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+import numpy as np
+from FenwickTree import FenwickTree, RangeFenwickTree
+
+def lower_bound(t, q):  # brute force over the prefix sums
+    res, s = -1, 0
+    for i in range(len(t) + 1):
+        if s < q:
+            res = i
+        if i != len(t):
+            s += t[i]
+    return res
+
+def main():
+    for it in range(20000):
+        N = random.randint(0, 9)
+        dtype = random.choice([None, np.int64])
+        fw = FenwickTree(N, dtype)
+        t = [0] * N
+        for i in range(N):
+            v = random.randint(0, 2)
+            fw.update(i, v)
+            t[i] += v
+        q = random.randint(0, 19)
+        assert fw.lower_bound(q) == lower_bound(t, q)
+        assert fw.kth(q) == lower_bound(t, q + 1)
+        if dtype is not None:
+            ft = FenwickTree.from_array(t, dtype)
+            assert list(ft.s) == list(fw.s)
+
+    for it in range(3000):  # RangeFenwickTree against a FenwickTree over the same array
+        N = random.randint(1, 12)
+        dtype = random.choice([None, np.int64])
+        rf, fw, t = RangeFenwickTree(N, dtype), FenwickTree(N, dtype), [0] * N
+        for _ in range(10):
+            l = random.randint(0, N)
+            r = random.randint(l, N)
+            x = random.randint(-5, 5)
+            rf.update(l, r, x)
+            for i in range(l, r):
+                fw.update(i, x)
+                t[i] += x
+            l = random.randint(0, N)
+            r = random.randint(l, N)
+            assert rf.range_sum(l, r) == fw.query(r) - fw.query(l) == sum(t[l:r])
+            assert rf.query(r) == fw.query(r)
+
+    for it in range(2000):  # update_many/query_many against a list, sparse and dense batches
+        N = random.randint(1, 200)
+        dtype = random.choice([np.int64, np.float64])
+        fw, t = FenwickTree(N, dtype), [0] * N
+        for _ in range(5):
+            dense = random.random() < 0.5  # K * N.bit_length() > N rebuilds from the whole array
+            K = random.randint(N // N.bit_length() + 1, 2 * N) if dense else random.randint(0, N // N.bit_length())
+            assert (K * N.bit_length() > N) == dense
+            P = [random.randrange(N) for _ in range(K)]  # repeats allowed
+            D = [random.randint(-10, 10) / (2 if dtype is np.float64 else 1) for _ in P]
+            if random.random() < 0.2:  # one dif for the whole batch
+                D = [3] * K
+                fw.update_many(P, 3)
+            else:
+                fw.update_many(P, D)
+            for p, d in zip(P, D):
+                t[p] += d
+            Q = [random.randint(0, N) for _ in range(random.randint(0, 20))]
+            res = fw.query_many(Q)
+            assert res.dtype == dtype and res.tolist() == [sum(t[:q]) for q in Q]
+            assert [fw.query(q) for q in Q] == res.tolist()
+
+    N = (1 << 25) + 7  # lower_bound must start its walk above the top bit of N
+    fw = FenwickTree(N, np.int32)
+    pos = sorted(random.sample(range(N), 50)) + [N - 1]
+    for p in pos:
+        fw.update(p, 1)
+    for k in range(len(pos)):
+        assert fw.kth(k) == pos[k]
+    assert fw.lower_bound(len(pos) + 1) == N
+    print("Tests passed!")
+
+main()
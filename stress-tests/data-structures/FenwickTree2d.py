@@ -0,0 +1,53 @@
+import importlib, os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+import numpy as np
+import FenwickTree2d
+
+def main():
+    for use_np in (True, False):
+        importlib.reload(FenwickTree2d)
+        if not use_np:
+            FenwickTree2d.np = None
+        FT = FenwickTree2d.FenwickTree2D
+        for it in range(1000):
+            n = random.randint(1, 10)
+            typecode = random.choice(['q', 'd'])
+            pts = [(random.randrange(n), random.randint(-5, 5)) for _ in range(random.randint(0, 15))]
+            a, b = FT(n, typecode), FT(n, typecode)
+            for x, y in pts:
+                a.fakeUpdate(x, y)
+            a.init()
+            b.build(pts)
+            assert (a.keys, a.off, a.W, a.yv) == (b.keys, b.off, b.W, b.yv)
+            ref = {}
+            for _ in range(20):
+                Q = [(random.randint(0, n), random.randint(-6, 6)) for _ in range(5)]
+                want = [sum(v for (x, y), v in ref.items() if x < qx and y < qy) for qx, qy in Q]
+                assert [a.query(x, y) for x, y in Q] == want
+                if use_np:
+                    assert b.query_many(*zip(*Q)).tolist() == want
+                if not pts:
+                    continue
+                U = random.choices(pts, k=random.randint(1, 6))
+                D = [random.randint(-5, 5) if typecode == 'q' else random.randint(-10, 10) / 2 for _ in U]
+                for (x, y), d in zip(U, D):
+                    a.update(x, y, d)
+                    ref[x, y] = ref.get((x, y), 0) + d
+                if use_np:
+                    b.update_many([x for x, _ in U], [y for _, y in U], D)
+                else:
+                    for (x, y), d in zip(U, D):
+                        b.update(x, y, d)
+                assert list(a.cnt) == list(b.cnt)
+
+        ft = FT(4)
+        ft.build([(1, 1)])
+        try:
+            ft.update(1, 1, 0.5)
+            assert False, "int64 sums took a float"
+        except TypeError:
+            pass
+    print("Tests passed!")
+
+main()
@@ -0,0 +1,47 @@
+import importlib, os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+import HashMap
+
+def main():
+    for use_np in (True, False):
+        importlib.reload(HashMap)
+        if not use_np:
+            HashMap.np = None
+        IntHashMap, EMPTY = HashMap.IntHashMap, HashMap.EMPTY
+        for it in range(300):
+            h, ref = IntHashMap(random.randint(0, 30)), {}
+            U = [random.randint(EMPTY + 1, -EMPTY - 1) for _ in range(5)] + list(range(-5, 30))
+            for _ in range(random.randint(0, 8)):
+                xs = [random.choice(U) for _ in range(random.randint(0, 60))]
+                if random.random() < 0.4:
+                    for x in xs:
+                        v = random.randint(-9, 9)
+                        if random.random() < 0.5:
+                            h.set(x, v)
+                            ref[x] = v
+                        else:
+                            h.add(x, v)
+                            ref[x] = ref.get(x, 0) + v
+                else:
+                    vs = [random.randint(-9, 9) for _ in xs] if random.random() < 0.5 else 1
+                    h.add_many(xs, vs)
+                    for i, x in enumerate(xs):
+                        ref[x] = ref.get(x, 0) + (vs if vs == 1 else vs[i])
+                assert len(h) == len(ref)
+                q = [random.choice(U) for _ in range(30)] + [EMPTY]
+                assert [int(v) for v in h.get_many(q, -7)] == [ref.get(x, -7) for x in q]
+                assert all(h.get(x, -7) == ref.get(x, -7) and (x in h) == (x in ref) for x in q)
+
+        h = IntHashMap()
+        h.add(5, 3)
+        for f in (lambda: h.set(EMPTY, 1), lambda: h.add(EMPTY), lambda: h.add_many([1, EMPTY, 2])):
+            try:
+                f()
+                assert False, "reserved key accepted"
+            except ValueError:
+                pass
+        assert len(h) == 1 and h.get(5) == 3
+    print("Tests passed!")
+
+main()
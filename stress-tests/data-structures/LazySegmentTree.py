@@ -0,0 +1,64 @@
+import os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from LazySegmentTree import LazySegmentTree, SparseLazySegmentTree
+
+inf = float('inf')
+
+def main():
+    for it in range(3000):
+        N = random.randint(1, 20)
+        typecode = random.choice([None, 'd'])
+        if random.random() < 0.7:
+            lo = random.randint(0, 5)
+            v = [random.randint(-9, 9) for _ in range(lo + N)]
+            trees, ref = [LazySegmentTree(v, lo, lo + N, typecode)], v[lo:]
+        else:  # starts as -inf
+            lo = random.randint(-5, 5)
+            trees = [LazySegmentTree(None, lo, lo + N, typecode),
+                     SparseLazySegmentTree(lo, lo + N, reserve=random.randint(0, 8), typecode=typecode)]
+            ref = [-inf] * N
+        for _ in range(60):
+            L = random.randint(lo - 2, lo + N + 2)
+            R = random.randint(L, lo + N + 3)
+            a, b = min(max(L, lo) - lo, N), max(min(R, lo + N) - lo, 0)
+            x = random.randint(-5, 5)
+            r = random.random()
+            if r < 0.35:
+                for tr in trees:
+                    assert tr.query(L, R) == max(ref[a:b], default=-inf)
+            elif r < 0.7:
+                for tr in trees:
+                    tr.add(L, R, x)
+                for i in range(a, b):
+                    ref[i] += x
+            else:
+                for tr in trees:
+                    tr.set(L, R, x)
+                for i in range(a, b):
+                    ref[i] = x
+
+    tr = LazySegmentTree([1.5, 2 ** 70, 3], 0, 3)  # floats and values past 2^62
+    assert tr.query(0, 3) == 2 ** 70 and tr.query(1, 1) == -inf
+    tr.add(0, 3, 2 ** 62)
+    assert tr.query(0, 1) == 1.5 + 2 ** 62 and tr.query(2, 3) == 3 + 2 ** 62
+
+    for limit in (1, 2, 3, 100, 5000):  # the node budget holds whatever the reserve
+        tr = SparseLazySegmentTree(0, 10 ** 18, limit=limit)
+        try:
+            for i in range(1000):
+                tr.set(i * 10 ** 15, i * 10 ** 15 + 7, i)
+        except MemoryError:
+            pass
+        assert tr.cnt <= limit and len(tr.ch) <= max(limit, 3)
+
+    tr = LazySegmentTree(None, 0, 10 ** 18)  # huge ranges without v dispatch to the sparse tree
+    assert isinstance(tr, SparseLazySegmentTree) and tr.query(0, 10 ** 18) == -inf
+    tr.set(0, 10 ** 18, 0)
+    tr.set(10 ** 17, 10 ** 18, 4)
+    tr.add(0, 2 * 10 ** 17, 1)
+    assert tr.query(0, 10 ** 17) == 1 and tr.query(0, 10 ** 18) == 5
+    assert isinstance(LazySegmentTree(None, 0, LazySegmentTree.dense_limit), LazySegmentTree)
+    print("Tests passed!")
+
+main()
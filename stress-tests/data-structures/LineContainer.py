@@ -0,0 +1,73 @@
+import os, random, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from LineContainer import LineContainer, MonotoneHull
+from LiChaoTree import LiChaoTree
+
+inf = float('inf')
+
+def best(lines, x):  # max over lines (k, m, l, r) with l <= x < r
+    return max((k * x + m for k, m, l, r in lines if l <= x < r), default=-inf)
+
+def bench(N):  # N interleaved add + query, slopes in +-10^6
+    K, M = 10 ** 6, 10 ** 12
+    for name in ('random', 'sorted'):
+        ks = [random.randint(-K, K) for _ in range(N)]
+        ms = [random.randint(-M, M) for _ in range(N)]
+        xs = [random.randint(-K, K) for _ in range(N)]
+        if name == 'sorted':
+            ks.sort()
+            xs.sort()
+        hulls = [LineContainer(), LiChaoTree(-K, K + 1)] + [MonotoneHull()] * (name == 'sorted')
+        res = []
+        for h in hulls:
+            t0 = time.perf_counter()
+            res.append([(h.add(k, m), h.query(x))[1] for k, m, x in zip(ks, ms, xs)])
+            print(f'{name:6} {type(h).__name__:13} N={N}: {time.perf_counter() - t0:.2f} s')
+        assert all(r == res[0] for r in res)
+
+def main():
+    for it in range(1000):  # LineContainer, any order
+        lc, lines = LineContainer(), []
+        lc.B = random.randint(1, 3)
+        for _ in range(random.randint(1, 40)):
+            k, m = random.randint(-10, 10), random.randint(-50, 50)
+            lc.add(k, m)
+            lines.append((k, m, -inf, inf))
+            x = random.randint(-30, 30)
+            assert lc.query(x) == best(lines, x)
+
+    for it in range(1000):  # MonotoneHull, increasing k and increasing x
+        mh, lines, x = MonotoneHull(), [], -30
+        ks = sorted(random.randint(-10, 10) for _ in range(random.randint(1, 40)))
+        for k in ks:
+            m = random.randint(-50, 50)
+            mh.add(k, m)
+            lines.append((k, m, -inf, inf))
+            x += random.randint(0, 2)
+            assert mh.query(x) == best(lines, x)
+
+    for it in range(1000):  # LiChaoTree over [lo, hi) or over xs, with segments
+        lo = random.randint(-20, 10)
+        hi = lo + random.randint(0, 30)
+        xs = sorted(random.sample(range(-50, 50), random.randint(1, 20))) if it % 2 else None
+        tr = LiChaoTree(lo, hi) if xs is None else LiChaoTree(xs=xs)
+        pts = xs or list(range(lo, hi))
+        lines = []
+        for _ in range(random.randint(1, 30)):
+            k, m = random.randint(-10, 10), random.randint(-50, 50)
+            if random.random() < 0.5:
+                tr.add(k, m)
+                lines.append((k, m, -inf, inf))
+            else:
+                l = random.randint(-60, 60)
+                r = random.randint(l, 61)
+                tr.add_segment(k, m, l, r)
+                lines.append((k, m, l, r))
+            for x in random.sample(pts, min(len(pts), 5)):
+                assert tr.query(x) == best(lines, x)
+
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 2 * 10 ** 5)
+    print("Tests passed!")
+
+main()
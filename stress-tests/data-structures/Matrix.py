@@ -0,0 +1,42 @@
+import importlib, os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+import Matrix as M
+
+MODS = [None, 1, 2, 10 ** 9 + 7, (1 << 61) - 1, (1 << 62) - 57, (1 << 62) + 135, 10 ** 30 + 57]
+
+def mul(A, B, mod):
+    res = [[sum(x * y for x, y in zip(r, c)) for c in zip(*B)] for r in A]
+    return res if mod is None else [[x % mod for x in r] for r in res]
+
+def main():
+    for use_np in (True, False):
+        importlib.reload(M)
+        if not use_np:
+            M.np = None
+        for it in range(400):
+            n = random.randint(1, 5)
+            mod = random.choice(MODS)
+            hi = mod or 100
+            d = [[random.randrange(-hi, 2 * hi) for _ in range(n)] for _ in range(n)]  # unreduced entries too
+            vec = [random.randrange(-hi, 2 * hi) for _ in range(n)]
+            A = M.Matrix(n, mod=mod)
+            A.d = d
+            p = random.choice([0, 1, 2, 3, random.randint(4, 40), random.randint(100, 10 ** 6)])
+            if mod is None:
+                p = min(p, 6)  # keep exact integers small
+            P = [[int(i == j) for j in range(n)] for i in range(n)]
+            P = P if mod is None else [[x % mod for x in r] for r in P]
+            B, e = d, p
+            while e:
+                if e & 1:
+                    P = mul(P, B, mod)
+                B, e = mul(B, B, mod), e >> 1
+            assert (A ** p).d == P
+            want = [r[0] for r in mul(P, [[x] for x in vec], mod)]
+            assert A.pow_apply(vec, p) == want
+            assert A * vec == [r[0] for r in mul(d, [[x] for x in vec], mod)]
+            assert (A * A).d == mul(d, d, mod)
+    print("Tests passed!")
+
+main()
@@ -0,0 +1,159 @@
+import os, random, sys
+from math import sqrt
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from MoQueries import mo, mo_order, mo_ranges, mo_with_updates, moTree
+
+class Window:  # checks that callbacks only touch the ends of [L, R)
+    def __init__(self, a):
+        self.a, self.L, self.R, self.sum, self.ops = a, 0, 0, 0, 0
+
+    def add(self, i, end):
+        if self.L == self.R:
+            self.L = self.R = i + (end == 0)
+        assert i == (self.L - 1 if end == 0 else self.R)
+        if end == 0:
+            self.L -= 1
+        else:
+            self.R += 1
+        self.sum += self.a[i]
+        self.ops += 1
+
+    def delete(self, i, end):
+        assert i == (self.L if end == 0 else self.R - 1)
+        if end == 0:
+            self.L += 1
+        else:
+            self.R -= 1
+        self.sum -= self.a[i]
+        self.ops += 1
+
+    def calc(self):
+        return self.sum
+
+def random_queries(n, q):
+    Q = []
+    for _ in range(q):
+        l, r = random.randint(0, n), random.randint(0, n)
+        Q.append((min(l, r), max(l, r)))
+    return Q
+
+def path(par, dep, u, v):
+    res = []
+    while u != v:
+        if dep[u] < dep[v]:
+            u, v = v, u
+        res.append(u)
+        u = par[u]
+    return res + [u]
+
+def main():
+    for it in range(1000):
+        n, q = random.randint(1, 300), random.randint(0, 300)
+        a = [random.randint(-9, 9) for _ in range(n)]
+        Q = random_queries(n, q)
+        for order in ('block', 'hilbert'):
+            w, stats = Window(a), {}
+            assert mo(Q, w.add, w.delete, w.calc, order, stats) == [sum(a[l:r]) for l, r in Q]
+            assert stats['moves'] == w.ops
+            if order == 'block' and n > 100 and q > 100:
+                assert w.ops < n * sqrt(q)
+    for it in range(1000):  # whole ranges, with the window kept as prefix sums
+        n, q = random.randint(1, 300), random.randint(0, 300)
+        a = [random.randint(-9, 9) for _ in range(n)]
+        P = [0]
+        for x in a:
+            P.append(P[-1] + x)
+        Q = random_queries(n, q)
+        win, moved = [0, 0], [0]  # [L, R) as the callbacks see it
+
+        def add_range(lo, hi, end):
+            assert lo < hi and (hi == win[0] if end == 0 else lo == win[1])
+            win[end] = lo if end == 0 else hi
+            moved[0] += hi - lo
+
+        def del_range(lo, hi, end):
+            assert lo < hi and (lo == win[0] if end == 0 else hi == win[1])
+            win[end] = hi if end == 0 else lo
+            moved[0] += hi - lo
+
+        for order in ('block', 'hilbert'):
+            win[:], moved[0], stats = [0, 0], 0, {}
+            calc = lambda: P[win[1]] - P[win[0]] if win[0] < win[1] else 0
+            assert mo_ranges(Q, add_range, del_range, calc, order, stats) == [sum(a[l:r]) for l, r in Q]
+            assert stats['moves'] == moved[0]
+
+    for it in range(1000):  # point assignments between queries
+        n = random.randint(1, 60)
+        a0 = [random.randint(-9, 9) for _ in range(n)]
+        U = [(random.randrange(n), random.randint(-9, 9)) for _ in range(random.randint(0, 60))]
+        Q = [(l, r, random.randint(0, len(U))) for l, r in random_queries(n, random.randint(0, 60))]
+        w, upd, T, ops = Window(a0[:]), U[:], [0], [0]
+
+        def swap(i, L, R):  # apply and undo are the same swap of U[i] with the array
+            p, x = upd[i]
+            assert (L, R) == (w.L, w.R)
+            upd[i] = (p, w.a[p])
+            if L <= p < R:
+                w.sum += x - w.a[p]
+            w.a[p] = x
+            ops[0] += 1
+
+        def apply(i, L, R):
+            assert i == T[0]
+            T[0] += 1
+            swap(i, L, R)
+
+        def undo(i, L, R):
+            assert i == T[0] - 1
+            T[0] -= 1
+            swap(i, L, R)
+
+        ref = []
+        for l, r, t in Q:
+            b = a0[:]
+            for p, x in U[:t]:
+                b[p] = x
+            ref.append(sum(b[l:r]))
+        stats = {}
+        assert mo_with_updates(Q, U, w.add, w.delete, apply, undo, w.calc, stats) == ref
+        assert stats['moves'] == w.ops + ops[0]
+
+    try:
+        mo_order([(0, 1)], 2, 'blocks')
+        assert False, "unknown order accepted"
+    except ValueError:
+        pass
+
+    for it in range(500):  # path sums on random trees
+        N = random.randint(1, 40)
+        par, dep, ed = [-1] * N, [0] * N, [[] for _ in range(N)]
+        for x in range(1, N):
+            par[x] = random.randrange(x)
+            dep[x] = dep[par[x]] + 1
+            ed[x].append(par[x])
+            ed[par[x]].append(x)
+        val = [random.randint(-9, 9) for _ in range(N)]
+        Q = [[random.randrange(N), random.randrange(N)] for _ in range(random.randint(0, 40))]
+        cur, on, ops = [0], [False] * N, [0]
+
+        def add(x, end):
+            assert not on[x]
+            on[x] = True
+            cur[0] += val[x]
+            ops[0] += 1
+
+        def delete(x, end):
+            assert on[x]
+            on[x] = False
+            cur[0] -= val[x]
+            ops[0] += 1
+
+        for order in ('block', 'hilbert'):
+            cur[0], on[:], ops[0], stats = 0, [False] * N, 0, {}
+            res = moTree(Q, ed, add, delete, lambda: cur[0], 0, order, stats)
+            assert res == [sum(val[x] for x in path(par, dep, u, v)) for u, v in Q]
+            assert stats['moves'] == ops[0]
+    print("Tests passed!")
+
+main()
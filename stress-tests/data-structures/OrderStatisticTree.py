@@ -0,0 +1,63 @@
+import os, random, sys, time
+from bisect import bisect_left, bisect_right
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from OrderStatisticTree import OrderStatisticSet
+
+def bench(N):  # N mixed add/rank
+    keys = [random.randrange(10 ** 9) for _ in range(N)]
+    ops = [random.random() < 0.5 for _ in range(N)]
+    for universe in (keys, None):
+        s = OrderStatisticSet(universe)
+        t0 = time.perf_counter()
+        for x, o in zip(keys, ops):
+            if o:
+                s.add(x)
+            else:
+                s.rank(x)
+        mode = 'universe' if universe else 'blocks'
+        print(f'OrderStatisticSet {mode:8} {N} add/rank: {time.perf_counter() - t0:.2f} s')
+
+def main():
+    for it in range(2000):
+        S = type('S', (OrderStatisticSet,), {'B': random.randint(1, 4)})  # tiny blocks and chunks
+        universe = random.sample(range(30), random.randint(0, 30)) if it % 2 else None
+        s, ref = S(universe), []
+        for _ in range(60):
+            x = random.randint(-2, 32)  # keys outside the universe switch to blocks
+            r = random.random()
+            if r < 0.45:
+                s.add(x)
+                if x not in ref:
+                    ref.insert(bisect_left(ref, x), x)
+            elif r < 0.75:
+                if x in ref:
+                    s.remove(x)
+                    ref.remove(x)
+                else:
+                    try:
+                        s.remove(x)
+                        assert False, "removed a missing key"
+                    except KeyError:
+                        pass
+            else:
+                s.discard(x)
+                if x in ref:
+                    ref.remove(x)
+            assert len(s) == len(ref) and list(s) == ref and (x in s) == (x in ref)
+            y = random.randint(-3, 33)
+            assert s.rank(y) == bisect_left(ref, y) and s.bisect(y) == bisect_right(ref, y)
+            if ref:
+                k = random.randrange(len(ref))
+                assert s.kth(k) == ref[k]
+            for k in (-1, len(ref)):
+                try:
+                    s.kth(k)
+                    assert False, "kth out of range"
+                except IndexError:
+                    pass
+
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
+    print("Tests passed!")
+
+main()
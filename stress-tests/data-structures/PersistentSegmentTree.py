@@ -0,0 +1,47 @@
+import os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from PersistentSegmentTree import PersistentSegmentTree
+
+def main():
+    for it in range(2000):
+        N = random.randint(1, 12)
+        if random.random() < 0.3:  # zero-node start
+            tr, vers = PersistentSegmentTree(N), [[0] * N]
+        else:
+            v = [random.randint(-9, 9) for _ in range(N)]
+            tr, vers = PersistentSegmentTree(v), [v]
+        for _ in range(30):
+            ver = random.randrange(len(vers))  # any older version
+            pos, x = random.randrange(N), random.randint(-9, 9)
+            a = vers[ver][:]
+            if random.random() < 0.5:
+                assert tr.update(ver, pos, x) == len(vers)
+                a[pos] = x
+            else:
+                assert tr.add(ver, pos, x) == len(vers)
+                a[pos] += x
+            vers.append(a)
+            ver = random.randrange(len(vers))
+            b = random.randint(0, N)
+            e = random.randint(b, N)
+            a = vers[ver]
+            assert tr.query_sum(ver, b, e) == sum(a[b:e])
+            assert tr.query_min(ver, b, e) == (min(a[b:e]) if b < e else None)
+        assert all(tr.query_sum(i, 0, N) == sum(a) for i, a in enumerate(vers))
+
+    for it in range(1000):  # k-th smallest of A[l:r] between versions
+        N = random.randint(1, 15)
+        A = [random.randint(0, 9) for _ in range(N)]
+        ranks = sorted(set(A))
+        tr = PersistentSegmentTree(len(ranks))
+        for i, x in enumerate(A):
+            tr.add(i, ranks.index(x), 1)
+        for _ in range(20):
+            l = random.randint(0, N - 1)
+            r = random.randint(l + 1, N)
+            k = random.randrange(r - l)
+            assert ranks[tr.kth(l, r, k)] == sorted(A[l:r])[k]
+    print("Tests passed!")
+
+main()
@@ -0,0 +1,54 @@
+import os, random, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+import numpy as np
+from RMQ import RMQ, BlockRMQ, build_rmq
+
+def check(V):
+    rmq, brmq, arg = RMQ(V), BlockRMQ(V), RMQ(V, argmin=True)
+    N = len(V)
+    for _ in range(200):
+        a = random.randrange(N)
+        b = random.randint(a + 1, N)
+        m = min(V[a:b])
+        assert rmq.query(a, b) == brmq.query(a, b) == m
+        assert arg.query(a, b) == list(V[a:b]).index(m) + a
+        assert rmq.query(np.int64(a), np.int64(b)) == m
+    A = [random.randrange(N) for _ in range(random.randint(0, 20))]
+    B = [random.randint(a + 1, N) for a in A]
+    for r in (rmq, arg):
+        assert list(r.query_many(A, B)) == [r.query(a, b) for a, b in zip(A, B)]
+
+def bench(N, Q):  # sparse table against BlockRMQ, with NumPy
+    V = np.random.randint(0, 1 << 30, N)
+    a = np.random.randint(0, N, Q)
+    b = np.minimum(a + np.random.randint(1, N, Q), N)
+    for cls in (RMQ, BlockRMQ):
+        t0 = time.perf_counter()
+        r = cls(V)
+        t1 = time.perf_counter()
+        res = [r.query(x, y) for x, y in zip(a.tolist(), b.tolist())]
+        t2 = time.perf_counter()
+        mem = r.flat.nbytes if cls is RMQ else r.mask.nbytes + r.blk.flat.nbytes
+        print(f'{cls.__name__:8} N={N}: build {t1 - t0:.2f} s, {mem >> 20} MiB, '
+              f'query {(t2 - t1) / Q * 1e6:.2f} us')
+        if cls is RMQ:
+            ans = res
+        assert res == ans
+
+def main():
+    for it in range(2000):
+        N = random.randint(1, 300)
+        V = [random.randint(-10, 10) for _ in range(N)]
+        check(random.choice([V, np.array(V), [float(x) for x in V]]))
+    for it in range(200):  # non-numeric values take the list path
+        N = random.randint(1, 100)
+        check([(random.randint(0, 3), chr(97 + random.randint(0, 3))) for _ in range(N)])
+    assert type(RMQ([3, 1, 2]).query(0, 3)) is int
+    assert type(BlockRMQ(np.array([3, 1, 2])).query(0, 3)) is int
+    assert isinstance(build_rmq(list(range(100)), limit=10), BlockRMQ)
+
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1 << 20, 10 ** 5)
+    print("Tests passed!")
+
+main()
@@ -0,0 +1,56 @@
+import os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from functools import reduce
+import numpy as np
+from SegmentTree import SegmentTree
+
+class Concat(SegmentTree):  # non-commutative, through the overridable f
+    unit = ''
+
+    def f(self, a, b):
+        return a + b
+
+def main():
+    for it in range(2000):
+        N = random.randint(0, 20)
+        kind = random.choice(['max', 'min', 'sum', 'gcd', 'xor', None, 'concat'])
+        if kind == 'concat':
+            tr, v, f, unit = Concat(N), [''] * N, lambda a, b: a + b, ''
+        elif kind is None:
+            tr, v, f, unit = SegmentTree(np.int64(N)), [float('-inf')] * N, max, float('-inf')
+        else:
+            v = [random.randint(0, 9) for _ in range(N)]
+            tr = SegmentTree(v, op=kind)
+            f, unit = tr.f, tr.unit
+        new = lambda: chr(97 + random.randrange(26)) if kind == 'concat' else random.randint(0, 9)
+        for _ in range(30):
+            r = random.random()
+            if r < 0.3 and N:
+                pos = random.randrange(N)
+                v[pos] = new()
+                tr.update(pos, v[pos])
+            elif r < 0.5 and N:  # batch, repeated positions: the last value wins
+                P = [random.randrange(N) for _ in range(random.randint(0, 6))]
+                X = [new() for _ in P]
+                for pos, x in zip(P, X):
+                    v[pos] = x
+                tr.update_many(P, X)
+            elif r < 0.7:
+                B = [random.randint(0, N) for _ in range(random.randint(0, 6))]
+                E = [random.randint(b, N) for b in B]
+                assert tr.query_many(B, E) == [reduce(f, v[b:e], unit) for b, e in zip(B, E)]
+            else:
+                b = random.randint(0, N)
+                e = random.randint(b, N)
+                assert tr.query(b, e) == reduce(f, v[b:e], unit)
+        assert tr.s[tr.n:] == v
+
+    try:
+        SegmentTree([2, 3, 4], op=lambda a, b: a * b)
+        assert False, "callable op without unit accepted"
+    except ValueError:
+        pass
+    print("Tests passed!")
+
+main()
@@ -0,0 +1,49 @@
+import os, random, sys, tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+import numpy as np
+from SubMatrix import SubMatrix
+
+def brute(v, u, l, d, r):
+    return sum(v[i][j] for i in range(u, d) for j in range(l, r))
+
+def rects(R, C, k):
+    res = []
+    for _ in range(k):
+        u, d = sorted(random.randint(0, R) for _ in range(2))
+        l, r = sorted(random.randint(0, C) for _ in range(2))
+        res.append((u, l, d, r))
+    return res
+
+def main(tmp):
+    for it in range(1000):
+        R = random.randint(0, 8)
+        C = random.randint(1, 8) if R else 0
+        kind = random.choice(['int', 'float', 'big', 'uint8'])
+        v = [[random.randint(-9, 9) for _ in range(C)] for _ in range(R)]
+        if kind == 'float':
+            v = [[x / 4 for x in row] for row in v]
+        elif kind == 'big':
+            v = [[x * 2 ** 70 for x in row] for row in v]
+        elif kind == 'uint8':
+            v = np.array(v, np.int64).reshape(R, C) % 256  # sums overflow uint8, not the table
+            v = v.astype(np.uint8)
+        ms = [SubMatrix(v, chunk=random.randint(1, 20))]
+        if kind != 'big':
+            path = os.path.join(tmp, f'{it}.npy')
+            ms.append(SubMatrix(v, path=path, chunk=random.randint(1, 20)))
+            ms.append(SubMatrix.load(path))
+        Q = rects(R, C, 10)
+        want = [brute([[int(x) if kind != 'float' else x for x in row] for row in v], *q) for q in Q]
+        for m in ms:
+            assert [m.sum(*q) for q in Q] == want
+            assert list(m.sum_many(*zip(*Q))) == want
+    try:
+        SubMatrix([[2 ** 70]], path=os.path.join(tmp, 'big.npy'))
+        assert False, "big ints stored in a .npy table"
+    except ValueError:
+        pass
+    print("Tests passed!")
+
+with tempfile.TemporaryDirectory() as tmp:
+    main(tmp)
@@ -0,0 +1,92 @@
+import os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+from Treap import Treap, LazyTreap
+
+def check(tr, n):  # heap order on priorities, sizes, returns the node count
+    if not n:
+        return 0
+    for ch in (tr.l[n], tr.r[n]):
+        assert not ch or tr.y[ch] <= tr.y[n]
+    assert tr.c[n] == check(tr, tr.l[n]) + check(tr, tr.r[n]) + 1
+    return tr.c[n]
+
+def move(v, l, r, k):  # list semantics of the C++ move: k <= l or k >= r, an index into v
+    a, b, c = v[:l], v[l:r], v[r:]
+    if k <= l:
+        return a[:k] + b + a[k:] + c
+    return a + c[:k - r] + b + c[k - r:]
+
+def main():
+    for it in range(2000):  # the plain Treap against a list
+        N = random.randint(0, 20)
+        tr, ref = Treap(), list(range(N))
+        t = tr.build(ref)
+        assert check(tr, t) == N
+        for _ in range(20):
+            r = random.random()
+            if r < 0.3:
+                k = random.randint(0, len(ref))
+                a, b = tr.split(t, k)
+                assert list(tr.each(a)) == ref[:k] and list(tr.each(b)) == ref[k:]
+                t = tr.merge(a, b)
+            elif r < 0.5:
+                pos = random.randint(0, len(ref))
+                t = tr.ins(t, tr.node(len(ref)), pos)
+                ref.insert(pos, len(ref))
+            elif r < 0.6:  # ins also takes a whole treap
+                pos, m = random.randint(0, len(ref)), random.randint(0, 3)
+                t = tr.ins(t, tr.build(range(len(ref), len(ref) + m)), pos)
+                ref[pos:pos] = range(len(ref), len(ref) + m)
+            elif r < 0.9:
+                l = random.randint(0, len(ref))
+                rr = random.randint(l, len(ref))
+                k = random.choice([random.randint(0, l), random.randint(rr, len(ref))])
+                t = tr.move(t, l, rr, k)
+                ref = move(ref, l, rr, k)
+            else:
+                k = random.randint(0, len(ref))
+                a, b = tr.split(t, k)
+                t = tr.merge(b, a)
+                ref = ref[k:] + ref[:k]
+            assert check(tr, t) == len(ref)
+        each = tr.each(t)
+        assert iter(each) is each and list(each) == ref
+
+    tr = Treap()  # no recursion in split, merge or each
+    t = tr.merge(tr.build(range(10 ** 5)), tr.build(range(10 ** 5, 2 * 10 ** 5)))
+    t = tr.merge(*tr.split(t, 12345)[::-1])
+    assert list(tr.each(t)) == list(range(12345, 2 * 10 ** 5)) + list(range(12345))
+
+    for it in range(1000):
+        N = random.randint(0, 15)
+        if it % 2:  # non-commutative op: string concatenation
+            tr, ref = LazyTreap(lambda a, b: a + b, '', None), [chr(97 + random.randrange(26)) for _ in range(N)]
+            agg = ''.join
+        else:
+            tr, ref = LazyTreap('min'), [random.randint(-9, 9) for _ in range(N)]
+            agg = lambda v: min(v, default=float('inf'))
+        t = tr.build(ref)
+        for _ in range(30):
+            lo = random.randint(0, N)
+            hi = random.randint(lo, N)
+            r = random.random()
+            if r < 0.4:
+                t = tr.reverse(t, lo, hi)
+                ref[lo:hi] = ref[lo:hi][::-1]
+            elif r < 0.6 and not it % 2:
+                x = random.randint(-3, 3)
+                t = tr.add(t, lo, hi, x)
+                for i in range(lo, hi):
+                    ref[i] += x
+            else:
+                t, q = tr.query(t, lo, hi)
+                assert q == agg(ref[lo:hi])
+        assert list(tr.each(t)) == ref
+
+    tr = LazyTreap(lambda a, b: a + b, '', None)
+    t = tr.reverse(tr.build('abcdef'), 1, 5)
+    assert ''.join(tr.each(t)) == tr.query(t, 0, 6)[1] == 'aedcbf'
+    print("Tests passed!")
+
+main()
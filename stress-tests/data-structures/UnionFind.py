@@ -0,0 +1,47 @@
+import os, random, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/data-structures'))
+
+import numpy as np
+from UnionFind import UnionFind
+
+def naive(n, A, B):
+    p = list(range(n))
+    def find(x):
+        while p[x] != x:
+            x = p[x]
+        return x
+    for a, b in zip(A, B):
+        p[find(a)] = find(b)
+    return [find(x) for x in range(n)]
+
+def same_partition(l1, l2):
+    m = {}
+    return all(m.setdefault(a, b) == b for a, b in zip(l1, l2)) and len(set(l1)) == len(set(l2))
+
+def main():
+    for it in range(5000):
+        n = random.randint(1, 30)
+        m = random.randint(0, 40)
+        if random.random() < 0.3:  # star
+            A = [random.randrange(n)] * m
+        else:
+            A = [random.randrange(n) for _ in range(m)]
+        B = [random.randrange(n) for _ in range(m)]
+        uf = UnionFind(n)
+        for a, b in zip(A[:m // 3], B[:m // 3]):
+            uf.join(a, b)
+        uf.union_many(A[m // 3:], B[m // 3:])
+        lab = list(uf.components())
+        assert same_partition(lab, naive(n, A, B))
+        assert all(uf.size(x) == lab.count(lab[x]) for x in range(n))
+        assert list(uf.find_many(range(n))) == [uf.find(x) for x in range(n)]
+
+    n = 10**6  # a hub must not cost one round per edge
+    for A, B in [(np.full(n, n - 1), np.arange(n)), (np.full(n, 0), np.arange(n))]:
+        uf = UnionFind(n)
+        start = time.time()
+        uf.union_many(A, B)
+        assert uf.size(0) == n and time.time() - start < 5
+    print("Tests passed!")
+
+main()
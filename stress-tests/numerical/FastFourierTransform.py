@@ -0,0 +1,48 @@
+import os, random, sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/numerical'))
+
+import numpy as np
+from FastFourierTransform import conv, fft
+from FastFourierTransformMod import fft_conv_mod
+
+def main():
+    for it in range(1000):
+        A = [random.randint(-10, 10) for _ in range(random.randint(0, 40))]
+        B = [random.randint(-10, 10) for _ in range(random.randint(0, 40))]
+        ref = [sum(A[i] * B[x - i] for i in range(len(A)) if 0 <= x - i < len(B))
+               for x in range(len(A) + len(B) - 1)] if A and B else []
+        a, b = random.choice([(A, B), (np.array(A, float), B), (A, np.array(B, np.int64))])
+        res = conv(a, b)
+        if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+            assert isinstance(res, np.ndarray) and res.dtype == np.float64
+        else:
+            assert isinstance(res, list)
+        assert len(res) == len(ref) and all(abs(x - y) < 1e-6 for x, y in zip(res, ref))
+
+    for it in range(1000):
+        mod = random.choice([2, 998244353, 10 ** 9 + 7, (1 << 42) + 15])  # the last one takes the big-int branch
+        A = [random.randrange(mod) for _ in range(random.randint(0, 30))]
+        B = [random.randrange(mod) for _ in range(random.randint(0, 30))]
+        ref = [sum(A[i] * B[x - i] for i in range(len(A)) if 0 <= x - i < len(B)) % mod
+               for x in range(len(A) + len(B) - 1)] if A and B else []
+        a, b = random.choice([(A, B), (np.array(A, np.int64), B), (A, np.array(B, np.int64))])
+        res = fft_conv_mod(a, b, mod)
+        if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+            assert isinstance(res, np.ndarray) and res.dtype == np.int64
+        else:
+            assert isinstance(res, list)
+        assert list(res) == ref
+
+    for bad in (np.zeros(8), np.zeros(16, np.complex128)[::2]):
+        try:
+            fft(bad)
+            assert False, "fft accepted a non-complex128 or strided array"
+        except TypeError:
+            pass
+    a = np.random.rand(64) + 1j * np.random.rand(64)
+    ref = np.fft.ifft(a) * 64  # fft here uses exp(+2 pi i k x / N)
+    fft(a)
+    assert np.allclose(a, ref)
+    print("Tests passed!")
+
+main()
@@ -0,0 +1,79 @@
+import os, random, sys, time
+from itertools import combinations
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../content/various'))
+
+from IntervalContainer import IntervalContainer
+from IntervalCover import interval_cover
+
+def runs(cov):  # maximal runs of covered points, as [l, r) intervals
+    res, x = [], 0
+    while x < len(cov):
+        if cov[x]:
+            l = x
+            while x < len(cov) and cov[x]:
+                x += 1
+            res.append((l, x))
+        x += 1
+    return res
+
+def covers(G, I, S):
+    return all(any(I[i][0] <= x < I[i][1] for i in S) for x in range(G[0], G[1]))
+
+def min_cover(G, I):  # size of a minimum cover, or None
+    for k in range(len(I) + 1):
+        if any(covers(G, I, S) for S in combinations(range(len(I)), k)):
+            return k
+    return None
+
+def bench(N):
+    ic, t0 = IntervalContainer(), time.perf_counter()
+    for _ in range(N):
+        l = random.randrange(10 ** 9)
+        r = l + random.randint(1, 10 ** 4)
+        if random.random() < 0.7:
+            ic.add_interval(l, r)
+        else:
+            ic.remove_interval(l, r)
+    print(f'IntervalContainer: {N} ops (7:3 add/remove) {time.perf_counter() - t0:.2f} s, '
+          f'{len(ic)} intervals left')
+    I = [(l, l + random.randint(1, 10 ** 4)) for l in (random.randrange(10 ** 9) for _ in range(N))]
+    t0 = time.perf_counter()
+    R = interval_cover((0, 10 ** 9), I + [(0, 10 ** 9 // 2), (10 ** 9 // 2, 10 ** 9)])
+    print(f'interval_cover: {N} intervals {time.perf_counter() - t0:.2f} s, {len(R)} used')
+
+def main():
+    for it in range(2000):
+        M = random.randint(1, 30)
+        ic, cov = IntervalContainer(), [False] * M
+        ic.B = random.randint(1, 4)  # small blocks, so splits and empty blocks happen
+        for _ in range(40):
+            l = random.randint(0, M)
+            r = random.randint(l, M)
+            if random.random() < 0.6:
+                got = ic.add_interval(l, r)
+                for x in range(l, r):
+                    cov[x] = True
+                if l < r:
+                    assert got in runs(cov) and got[0] <= l and r <= got[1]
+                else:
+                    assert got is None
+            else:
+                ic.remove_interval(l, r)
+                for x in range(l, r):
+                    cov[x] = False
+            assert list(ic) == runs(cov)
+            assert len(ic) == len(runs(cov)) and ic.covered == sum(cov)
+
+    for it in range(2000):
+        G = (random.randint(0, 5), random.randint(0, 10))
+        I = [(a, a + random.randint(0, 5)) for a in (random.randint(0, 10) for _ in range(random.randint(0, 7)))]
+        R, k = interval_cover(G, I), min_cover(G, I)
+        if k is None:
+            assert R == []
+        else:
+            assert len(R) == k and covers(G, I, R)
+
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 6)
+    print("Tests passed!")
+
+main()